@@ -1,10 +1,13 @@
+import msgspec
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from app.Models.notes import Notes
 
 from uuid import UUID
 
+BULK_MAX_ITEMS = 1000
+
 class NotesCreateDTO(BaseModel):
     """DTO for creating a new note"""
     title: str = Field(..., min_length=1, max_length=200, description="Note title")
@@ -18,6 +21,36 @@ class NotesUpdateDTO(BaseModel):
     content: Optional[str] = Field(None, min_length=1, description="Note content")
 
 
+class NotesBulkCreateDTO(BaseModel):
+    """DTO for creating many notes in one request"""
+    notes: List[NotesCreateDTO] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class NotesBulkUpdateItemDTO(NotesUpdateDTO):
+    """DTO for one entry of a bulk update"""
+    id_notes: int = Field(..., description="ID of the note to update")
+
+
+class NotesBulkUpdateDTO(BaseModel):
+    """DTO for updating many notes in one request"""
+    notes: List[NotesBulkUpdateItemDTO] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class NotesBulkItemResultDTO(BaseModel):
+    """Outcome of a single item in a bulk request"""
+    index: int
+    id_notes: Optional[int] = None
+    status: str
+    error: Optional[str] = None
+
+
+class NotesBulkResultDTO(BaseModel):
+    """Per-item report of a bulk request"""
+    succeeded: int
+    failed: int
+    results: List[NotesBulkItemResultDTO]
+
+
 class NotesResponseDTO(BaseModel):
     """DTO for note responses"""
     model_config = ConfigDict(from_attributes=True)
@@ -41,6 +74,23 @@ class NotesResponseDTO(BaseModel):
         )
 
 
+class NotesSimilarDTO(NotesResponseDTO):
+    """DTO for similar-note results, with cosine similarity to the query"""
+    score: float
+
+    @classmethod
+    def from_match(cls, note: Notes, score: float) -> "NotesSimilarDTO":
+        return cls(
+            id_notes=note.id_notes,
+            id_user=note.id_user,
+            title=note.title,
+            content=note.content,
+            created_at=note.created_at,
+            updated_at=note.updated_at,
+            score=score
+        )
+
+
 class NotesWithUserDTO(NotesResponseDTO):
     """DTO for note responses with user information"""
     user_name: str
@@ -57,4 +107,26 @@ class NotesWithUserDTO(NotesResponseDTO):
             updated_at=note.updated_at,
             user_name=note.user.nama if note.user else "Unknown",
             user_email=note.user.email if note.user else "Unknown"
-        )
\ No newline at end of file
+        )
+
+
+class NotesRecord(msgspec.Struct):
+    """Read-path twin of NotesResponseDTO: built positionally from a NOTE_COLUMNS row and
+    encoded by Litestar's msgspec encoder without pydantic validation"""
+    id_notes: int
+    id_user: UUID
+    title: str
+    content: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class NotesExportRecord(NotesRecord):
+    """Export row: NOTE_COLUMNS followed by the names of the note's detected emotions"""
+    emotions: List[str]
+
+
+class NotesSearchRecord(NotesRecord):
+    """Full-text search hit: NOTE_COLUMNS followed by relevance and a highlighted excerpt"""
+    rank: float
+    snippet: str
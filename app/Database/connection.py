@@ -1,20 +1,50 @@
 import os
 from typing import AsyncGenerator
 
-from sqlmodel import text, SQLModel
-
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from sqlalchemy.orm import sessionmaker
 from contextlib import asynccontextmanager
 
-from app.Database.config import async_engine
+from app.Database.config import async_engine, Config, TimedQueuePool
+from app.Database.migrations import ensure_schema
+from utils.metrics import record_pool_wait
 
-async_session = sessionmaker(
+# The one session factory for the process; every request and background job draws from it
+async_session = async_sessionmaker(
     async_engine, expire_on_commit=False, class_=AsyncSession
 )
 
+class PoolStats:
+    """Counters for how long requests wait to get a pooled connection."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> dict:
+        pool = async_engine.pool
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": Config.DB_MAX_OVERFLOW,
+            "timeout": Config.DB_POOL_TIMEOUT,
+            "checkouts": self.checkouts,
+            "avg_wait_ms": self.total_wait / self.checkouts * 1000 if self.checkouts else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+pool_stats = PoolStats()
+TimedQueuePool.wait_listeners.extend([pool_stats.record_wait, record_pool_wait])
+
 async def init_db():
     async with async_engine.begin() as conn:
         from app.Models.user import User
@@ -22,8 +52,11 @@ async def init_db():
         from app.Models.note_emotions import NoteEmotion
         from app.Models.emotions import Emotion
         from app.Models.recomendastions import Recommendation
+        from app.Models.inference_cache import InferenceCacheEntry
+        from app.Models.user_profile import UserProfile
+        from app.Models.mood_rollup import MoodRollup
 
-        await conn.run_sync(SQLModel.metadata.create_all)
+        await ensure_schema(conn)
 
 @asynccontextmanager
 async def get_db_connection() -> AsyncGenerator[AsyncSession, None]:
@@ -56,11 +89,19 @@ def execute_insert(query: str, params: tuple = ()) -> int:
         conn.commit()
         return cursor.lastrowid
     
+async def provide_session() -> AsyncGenerator[AsyncSession, None]:
+    """Litestar dependency: one session per request. It checks out a connection on its first
+    query, not up front; the wait is timed by TimedQueuePool."""
+    async with async_session() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
 @asynccontextmanager
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to provide the session object"""
-    async_session = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
-    
+    """Session for code running outside a request (background workers, startup, streams)"""
     async with async_session() as session:
         try:
             yield session
@@ -68,4 +109,7 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+async def close_db() -> None:
+    await async_engine.dispose()
\ No newline at end of file
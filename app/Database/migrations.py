@@ -0,0 +1,196 @@
+import hashlib
+import logging
+from typing import List, Tuple
+
+from sqlmodel import SQLModel, text
+
+from app.Database.config import Config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+# Any constant works; it only has to be the same in every worker
+SCHEMA_LOCK_KEY = 0x6D6F6F64
+
+ROLLUP_PERIODS = ("day", "week")
+
+# Rollup rows recomputed from scratch; used for the first backfill and by services/mood_rollup.py
+MOOD_ROLLUP_SELECT = " UNION ALL ".join(
+    f"""
+    SELECT n.id_user, '{period}', date_trunc('{period}', n.created_at)::date, ne.id_emotion, count(*)
+    FROM note_emotions ne JOIN notes n ON n.id_notes = ne.id_notes
+    GROUP BY 1, 2, 3, 4
+    """
+    for period in ROLLUP_PERIODS
+)
+
+# Schema changes that SQLModel.metadata.create_all cannot express or cannot apply to
+# tables that already exist. Every statement must be idempotent; they run in order.
+MIGRATIONS: List[Tuple[str, List[str]]] = [
+    ("notes keyset pagination index", [
+        "CREATE INDEX IF NOT EXISTS ix_notes_user_created_id "
+        "ON notes (id_user, created_at DESC, id_notes DESC)",
+    ]),
+    ("notes full-text search vector", [
+        "ALTER TABLE notes ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        f"setweight(to_tsvector('{Config.SEARCH_TEXT_CONFIG}'::regconfig, coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{Config.SEARCH_TEXT_CONFIG}'::regconfig, coalesce(content, '')), 'B')"
+        ") STORED",
+        "CREATE INDEX IF NOT EXISTS ix_notes_search_vector ON notes USING GIN (search_vector)",
+    ]),
+    ("note_emotions cascade on note delete", [
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conname = 'note_emotions_id_notes_fkey' AND confdeltype = 'c'
+            ) THEN
+                ALTER TABLE note_emotions DROP CONSTRAINT IF EXISTS note_emotions_id_notes_fkey;
+                ALTER TABLE note_emotions ADD CONSTRAINT note_emotions_id_notes_fkey
+                    FOREIGN KEY (id_notes) REFERENCES notes (id_notes) ON DELETE CASCADE;
+            END IF;
+        END $$
+        """,
+    ]),
+    ("mood rollups maintained by triggers", [
+        """
+        CREATE OR REPLACE FUNCTION mood_rollup_bump(p_user uuid, p_at timestamp, p_emotion integer, p_delta integer)
+        RETURNS void AS $$
+        BEGIN
+            INSERT INTO mood_rollups (id_user, period, period_start, id_emotion, note_count)
+            VALUES (p_user, 'day', date_trunc('day', p_at)::date, p_emotion, p_delta),
+                   (p_user, 'week', date_trunc('week', p_at)::date, p_emotion, p_delta)
+            ON CONFLICT (id_user, period, period_start, id_emotion)
+            DO UPDATE SET note_count = mood_rollups.note_count + EXCLUDED.note_count;
+
+            DELETE FROM mood_rollups
+            WHERE id_user = p_user AND id_emotion = p_emotion AND note_count <= 0
+              AND ((period = 'day' AND period_start = date_trunc('day', p_at)::date)
+                OR (period = 'week' AND period_start = date_trunc('week', p_at)::date));
+        END $$ LANGUAGE plpgsql
+        """,
+        # When a whole note is deleted its note_emotions rows vanish through the cascade after the
+        # note row is gone, so the per-row trigger below finds no note and this one does the decrement
+        """
+        CREATE OR REPLACE FUNCTION note_emotions_rollup() RETURNS trigger AS $$
+        DECLARE
+            note RECORD;
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                SELECT id_user, created_at INTO note FROM notes WHERE id_notes = OLD.id_notes;
+                IF FOUND THEN
+                    PERFORM mood_rollup_bump(note.id_user, note.created_at, OLD.id_emotion, -1);
+                END IF;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                SELECT id_user, created_at INTO note FROM notes WHERE id_notes = NEW.id_notes;
+                IF FOUND THEN
+                    PERFORM mood_rollup_bump(note.id_user, note.created_at, NEW.id_emotion, 1);
+                END IF;
+                RETURN NEW;
+            END IF;
+
+            RETURN OLD;
+        END $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE OR REPLACE FUNCTION notes_rollup_delete() RETURNS trigger AS $$
+        DECLARE
+            tagged RECORD;
+        BEGIN
+            FOR tagged IN SELECT id_emotion FROM note_emotions WHERE id_notes = OLD.id_notes LOOP
+                PERFORM mood_rollup_bump(OLD.id_user, OLD.created_at, tagged.id_emotion, -1);
+            END LOOP;
+            RETURN OLD;
+        END $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS trg_note_emotions_rollup ON note_emotions",
+        "CREATE TRIGGER trg_note_emotions_rollup AFTER INSERT OR UPDATE OR DELETE ON note_emotions "
+        "FOR EACH ROW EXECUTE FUNCTION note_emotions_rollup()",
+        "DROP TRIGGER IF EXISTS trg_notes_rollup_delete ON notes",
+        "CREATE TRIGGER trg_notes_rollup_delete BEFORE DELETE ON notes "
+        "FOR EACH ROW EXECUTE FUNCTION notes_rollup_delete()",
+        # First backfill only; later backfills go through `python -m services.mood_rollup rebuild`
+        "INSERT INTO mood_rollups (id_user, period, period_start, id_emotion, note_count) "
+        f"SELECT * FROM ({MOOD_ROLLUP_SELECT}) AS fresh WHERE NOT EXISTS (SELECT 1 FROM mood_rollups)",
+    ]),
+    ("note_emotions label source", [
+        # NULL for rows written before sources were recorded; those are not used for training
+        "ALTER TABLE note_emotions ADD COLUMN IF NOT EXISTS source varchar(10)",
+    ]),
+    ("seed plutchik emotions", [
+        # Analysis only stores emotions already in the catalog, so the eight it can answer must exist
+        "INSERT INTO emotions (tipe_emosi) "
+        "SELECT name FROM unnest(ARRAY['anger', 'anticipation', 'disgust', 'fear', 'joy', 'sadness', 'surprise', 'trust']) AS name "
+        "WHERE NOT EXISTS (SELECT 1 FROM emotions e WHERE lower(btrim(e.tipe_emosi)) = name)",
+    ]),
+    ("inference_cache expiry index", [
+        # Same name create_all gives the model's index; serves both the TTL lookup and the purge
+        "CREATE INDEX IF NOT EXISTS ix_inference_cache_created_at ON inference_cache (created_at)",
+    ]),
+]
+
+async def apply_migrations(conn) -> None:
+    for _, statements in MIGRATIONS:
+        for statement in statements:
+            await conn.execute(text(statement))
+
+def schema_fingerprint() -> str:
+    """Hash of every mapped table's columns plus the text of all migration statements.
+
+    Changes whenever a model or MIGRATIONS changes, so nobody has to remember to bump a number.
+    It describes the code, not the live database: indexes, constraints or columns changed
+    out of band are not detected and will not trigger a re-run (delete the schema_version
+    row to force one). Models must be imported before calling this.
+    """
+    digest = hashlib.sha256()
+    for table in sorted(SQLModel.metadata.tables.values(), key=lambda table: table.name):
+        digest.update(table.name.encode("utf-8"))
+        for column in table.columns:
+            digest.update(f"{column.name}:{column.type!r}:{column.nullable}:{column.primary_key}".encode("utf-8"))
+
+    for name, statements in MIGRATIONS:
+        digest.update(name.encode("utf-8"))
+        for statement in statements:
+            digest.update(statement.encode("utf-8"))
+
+    return digest.hexdigest()
+
+async def _stored_fingerprint(conn) -> str:
+    exists = (await conn.execute(text(f"SELECT to_regclass('{SCHEMA_VERSION_TABLE}')"))).scalar()
+    if not exists:
+        return ""
+    return (await conn.execute(text(f"SELECT fingerprint FROM {SCHEMA_VERSION_TABLE}"))).scalar() or ""
+
+async def ensure_schema(conn) -> bool:
+    """Create tables and apply migrations only when the stored fingerprint is out of date.
+
+    A normal boot costs two tiny queries. Returns True when the schema was (re)applied.
+    """
+    fingerprint = schema_fingerprint()
+    if await _stored_fingerprint(conn) == fingerprint:
+        return False
+
+    # Several workers may boot at once; let one migrate while the others wait and re-check
+    await conn.execute(text(f"SELECT pg_advisory_xact_lock({SCHEMA_LOCK_KEY})"))
+    if await _stored_fingerprint(conn) == fingerprint:
+        return False
+
+    await conn.run_sync(SQLModel.metadata.create_all)
+    await apply_migrations(conn)
+
+    await conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (fingerprint varchar(64) NOT NULL, applied_at timestamp NOT NULL)"
+    ))
+    await conn.execute(text(f"DELETE FROM {SCHEMA_VERSION_TABLE}"))
+    await conn.execute(
+        text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (fingerprint, applied_at) VALUES (:fingerprint, now())"),
+        {"fingerprint": fingerprint}
+    )
+
+    logger.info("Database schema updated to %s", fingerprint[:12])
+    return True
@@ -0,0 +1,20 @@
+from sqlmodel import SQLModel, Field, Column
+import sqlalchemy.dialects.postgresql as pg
+from datetime import datetime
+from typing import Any, Dict
+
+class InferenceCacheEntry(SQLModel, table=True):
+    __tablename__ = "inference_cache"
+
+    cache_key: str = Field(primary_key=True, max_length=64)
+    model: str = Field(max_length=100)
+    result: Dict[str, Any] = Field(sa_column=Column(pg.JSONB, nullable=False))
+    created_at: datetime = Field(default_factory=datetime.now, index=True)
+
+    def to_dict(self):
+        return {
+            'cache_key': self.cache_key,
+            'model': self.model,
+            'result': self.result,
+            'created_at': self.created_at
+        }
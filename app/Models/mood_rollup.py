@@ -0,0 +1,29 @@
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import ForeignKey, Integer
+import sqlalchemy.dialects.postgresql as pg
+from datetime import date
+
+from uuid import UUID
+
+class MoodRollup(SQLModel, table=True):
+    """Analysed notes per user, period and emotion.
+
+    Maintained by database triggers on note_emotions and notes (see app/Database/migrations.py);
+    the application only reads it, apart from services/mood_rollup.py rebuilds.
+    """
+    __tablename__ = "mood_rollups"
+
+    id_user: UUID = Field(sa_column=Column(pg.UUID, ForeignKey("users.uid", ondelete="CASCADE"), primary_key=True))
+    period: str = Field(primary_key=True, max_length=5)  # "day" or "week"
+    period_start: date = Field(primary_key=True)
+    id_emotion: int = Field(sa_column=Column(Integer, ForeignKey("emotions.id_emotion", ondelete="CASCADE"), primary_key=True))
+    note_count: int = Field(default=0)
+
+    def to_dict(self):
+        return {
+            'id_user': self.id_user,
+            'period': self.period,
+            'period_start': self.period_start,
+            'id_emotion': self.id_emotion,
+            'note_count': self.note_count
+        }
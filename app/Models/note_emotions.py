@@ -1,4 +1,5 @@
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Column
+from sqlalchemy import ForeignKey, Integer
 from typing import Optional, Dict, TYPE_CHECKING, Any
 
 from uuid import UUID
@@ -14,8 +15,10 @@ class NoteEmotion(NoteEmotionBase, table=True):
     __tablename__ = "note_emotions"
     
     id_noteEmotions: Optional[int] = Field(default=None, primary_key=True)
-    id_notes: int = Field(foreign_key="notes.id_notes")
+    id_notes: int = Field(sa_column=Column(Integer, ForeignKey("notes.id_notes", ondelete="CASCADE"), nullable=False))
     id_emotion: int = Field(foreign_key="emotions.id_emotion")
+    # Who produced the label: "llm", "local" (the in-process classifier) or "human"
+    source: Optional[str] = Field(default=None, max_length=10)
     
     # Relationships
     note: Optional["Notes"] = Relationship(back_populates="note_emotions")
@@ -25,14 +28,16 @@ class NoteEmotion(NoteEmotionBase, table=True):
         return {
             'id_noteEmotions': self.id_noteEmotions,
             'id_notes': self.id_notes,
-            'id_emotion': self.id_emotion
+            'id_emotion': self.id_emotion,
+            'source': self.source
         }
     
     def to_dict_with_relations(self, include_note: bool = False, include_emotion: bool = False) -> Dict[str, Any]:
         result = {
             'id_noteEmotions': self.id_noteEmotions,
             'id_notes': self.id_notes,
-            'id_emotion': self.id_emotion
+            'id_emotion': self.id_emotion,
+            'source': self.source
         }
 
         if include_note and self.note:
@@ -85,4 +85,14 @@ class Token(SQLModel):
 
 class TokenData(SQLModel):
     email: Optional[str] = None
-    user_id: Optional[UUID] = None
\ No newline at end of file
+    user_id: Optional[UUID] = None
+    expires_at: Optional[datetime] = None
+
+class AuthenticatedUser(SQLModel):
+    """Detached snapshot of the fields the auth guard needs, safe to cache between requests"""
+    uid: UUID
+    email: str
+    nama: Optional[str] = None
+    tipe_keperibadian: Optional[str] = None
+    is_active: bool
+    locked_until: Optional[datetime] = None
\ No newline at end of file
@@ -0,0 +1,28 @@
+from sqlmodel import SQLModel, Field, Column
+import sqlalchemy.dialects.postgresql as pg
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from uuid import UUID
+
+class UserProfile(SQLModel, table=True):
+    __tablename__ = "user_profiles"
+
+    id_user: UUID = Field(foreign_key="users.uid", primary_key=True)
+    mbti: Optional[str] = Field(default=None, max_length=20)
+    mbti_counts: Dict[str, int] = Field(default_factory=dict, sa_column=Column(pg.JSONB, nullable=False, default=dict))
+    emotion_counts: Dict[str, int] = Field(default_factory=dict, sa_column=Column(pg.JSONB, nullable=False, default=dict))
+    recent_notes: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(pg.JSONB, nullable=False, default=list))
+    note_count: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+    def to_dict(self):
+        return {
+            'id_user': self.id_user,
+            'mbti': self.mbti,
+            'mbti_counts': self.mbti_counts,
+            'emotion_counts': self.emotion_counts,
+            'recent_notes': self.recent_notes,
+            'note_count': self.note_count,
+            'updated_at': self.updated_at
+        }
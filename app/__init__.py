@@ -1,20 +1,36 @@
 from litestar import Litestar
 from litestar.config.cors import CORSConfig
 from litestar.openapi import OpenAPIConfig
+from litestar.di import Provide
 
-from huggingface_hub import login
 from routes.routes import routes
-from app.Database.connection import init_db
-import os
+from app.Database.connection import init_db, close_db, provide_session
+from services.inference_service import inference_service
+from services.emotion_classifier import emotion_classifier
+from services.emotion_pipeline import emotion_pipeline
+from services.note_events import note_events
+from services.catalog import emotion_catalog
+from app.Database.config import Config, async_engine
+from utils.pagination import NEXT_CURSOR_HEADER
+from utils.metrics import MetricsMiddleware, instrument_engine
+from utils.security import security_manager
+from utils.rate_limit import RateLimitMiddleware
 
 async def startup_handler() -> None:
     await init_db()
+    await emotion_catalog.load()
+
+    if Config.LOCAL_CLASSIFIER_ENABLED:
+        await emotion_classifier.train_from_db(Config.LOCAL_CLASSIFIER_TRAINING_ROWS)
 
 def create_app() -> Litestar:    
     cors_config = CORSConfig(
         allow_origins=["*"],
         allow_methods=["GET", "POST", "PUT", "DELETE"],
         allow_headers=["*"],
+        expose_headers=[
+            NEXT_CURSOR_HEADER, "ETag", "RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy", "Retry-After"
+        ],
     )
     
     openapi_config = OpenAPIConfig(
@@ -23,16 +39,19 @@ def create_app() -> Litestar:
         description="A Project For Moodiary",
     )
     
+    instrument_engine(async_engine)
+
     app = Litestar(
         route_handlers=routes,
         cors_config=cors_config,
         openapi_config=openapi_config,
-        on_startup=[startup_handler],  # Initialize database on startup
+        on_startup=[startup_handler, emotion_pipeline.start],  # Database and analysis workers; the LLM client is created on first use
+        on_shutdown=[note_events.drain, emotion_pipeline.stop, inference_service.shutdown, security_manager.shutdown, close_db],
+        dependencies={"db_session": Provide(provide_session)},
+        middleware=[MetricsMiddleware, RateLimitMiddleware],
         debug=True
     )
 
-    login(token=os.getenv("HUGGINGFACE_API_KEY"))
-    
     return app
 
 apps = create_app()
\ No newline at end of file
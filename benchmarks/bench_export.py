@@ -0,0 +1,138 @@
+"""Streaming export memory: peak RSS while exporting a large diary.
+
+Seeds a throwaway user with --notes notes (a third of them tagged with an emotion) in the
+configured database (DATABASE_URL), streams the export as services/note_export.py serves it,
+and samples RSS after every chunk. With --compare-naive it then loads the same rows in one
+go, as paging everything into a list would, to show the difference. Seeded rows are deleted.
+
+    python -m benchmarks.bench_export --notes 100000 --format ndjson --emotions
+"""
+import argparse
+import asyncio
+import gc
+import resource
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+
+from app.Database.config import Config
+from app.Database.connection import close_db, get_session, init_db
+from app.Models.emotions import Emotion
+from app.Models.note_emotions import NoteEmotion
+from app.Models.notes import Notes
+from app.Models.user import User
+from services.catalog import emotion_catalog
+from services.note_export import export_notes
+from utils.security import security_manager
+
+SEED_BATCH = 5000
+
+def rss_mib() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Not Linux: fall back to the peak, which is still an upper bound
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def seed(count: int) -> uuid.UUID:
+    uid = uuid.uuid4()
+    start = datetime.now() - timedelta(minutes=count)
+
+    async with get_session() as session:
+        session.add(User(
+            uid=uid,
+            email=f"bench-{uid.hex[:12]}@example.com",
+            password=security_manager.get_password_hash("Benchmark#2024"),
+            nama="Benchmark",
+            tipe_keperibadian="INTJ",
+        ))
+        emotion_ids = (await session.exec(select(Emotion.id_emotion))).scalars().all()
+        await session.flush()
+
+        for offset in range(0, count, SEED_BATCH):
+            rows = [{
+                "id_user": uid,
+                "title": f"Catatan {i}",
+                "content": f"Hari ke-{i}: " + "aku menulis sesuatu tentang hari ini. " * 8,
+                "created_at": start + timedelta(minutes=i),
+                "updated_at": start + timedelta(minutes=i),
+            } for i in range(offset, min(offset + SEED_BATCH, count))]
+            result = await session.execute(insert(Notes).returning(Notes.id_notes), rows)
+            note_ids = result.scalars().all()
+
+            if emotion_ids:
+                await session.execute(insert(NoteEmotion), [
+                    {"id_notes": note_id, "id_emotion": emotion_ids[note_id % len(emotion_ids)]}
+                    for note_id in note_ids[::3]
+                ])
+
+        await session.commit()
+
+    return uid
+
+async def cleanup(uid: uuid.UUID) -> None:
+    async with get_session() as session:
+        await session.execute(delete(Notes).where(Notes.id_user == uid))
+        await session.execute(delete(User).where(User.uid == uid))
+        await session.commit()
+
+async def stream_export(uid: uuid.UUID, fmt: str, with_emotions: bool, chunk_size: int) -> None:
+    gc.collect()
+    baseline = rss_mib()
+    peak = baseline
+    total_bytes = 0
+    first_byte = None
+
+    start = time.perf_counter()
+    async for chunk in export_notes(uid, fmt, with_emotions, chunk_size):
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        total_bytes += len(chunk)
+        peak = max(peak, rss_mib())
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"streamed   {total_bytes / 2**20:8.1f} MiB in {elapsed:6.2f} s, first byte after {first_byte * 1000:6.1f} ms, "
+        f"RSS {baseline:7.1f} -> peak {peak:7.1f} MiB (+{peak - baseline:.1f})"
+    )
+
+async def naive_export(uid: uuid.UUID) -> None:
+    gc.collect()
+    baseline = rss_mib()
+
+    async with get_session() as session:
+        result = await session.exec(select(Notes).where(Notes.id_user == uid).order_by(Notes.created_at))
+        notes = result.scalars().all()
+        payload = [note.model_dump(mode="json") for note in notes]
+
+    print(f"naive      {len(payload)} notes held at once, RSS {baseline:7.1f} -> {rss_mib():7.1f} MiB (+{rss_mib() - baseline:.1f})")
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=100_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--emotions", action="store_true")
+    parser.add_argument("--chunk-size", type=int, default=Config.EXPORT_CHUNK_SIZE)
+    parser.add_argument("--compare-naive", action="store_true")
+    args = parser.parse_args()
+
+    await init_db()
+    await emotion_catalog.load()
+    uid = await seed(args.notes)
+    try:
+        print(f"{args.notes} notes, {args.format}, emotions={args.emotions}, chunk size {args.chunk_size}")
+        await stream_export(uid, args.format, args.emotions, args.chunk_size)
+        if args.compare_naive:
+            await naive_export(uid)
+    finally:
+        await cleanup(uid)
+        await close_db()
+
+if __name__ == "__main__":
+    asyncio.run(main())
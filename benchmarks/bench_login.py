@@ -0,0 +1,75 @@
+"""Login throughput with bcrypt on the event loop versus on the hashing pool.
+
+Each simulated login verifies a password against a stored hash, as
+AuthService.authenticate_user does. While the logins run, a ticker task measures
+how late the event loop wakes it up, which is what every other endpoint feels.
+
+    python -m benchmarks.bench_login --logins 64 --rounds 12 --workers 4
+"""
+import argparse
+import asyncio
+import os
+import time
+
+async def ticker(lags: list, stop: asyncio.Event, interval: float = 0.005) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+async def run(label: str, login, logins: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    lags, stop = [], asyncio.Event()
+
+    async def one() -> None:
+        async with semaphore:
+            await login()
+
+    probe = asyncio.create_task(ticker(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99)] if lags else 0.0
+    worst = lags[-1] if lags else elapsed
+    print(
+        f"{label:<10} {logins / elapsed:8.1f} logins/s   "
+        f"loop lag p99 {p99 * 1000:8.1f} ms   max {worst * 1000:8.1f} ms"
+    )
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+
+    # Config is read at import time
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ["PASSWORD_HASH_EXECUTOR"] = args.executor
+    from utils.security import security_manager
+
+    password = "Benchmark#2024"
+    stored = security_manager.get_password_hash(password)
+
+    async def inline_login() -> None:
+        assert security_manager.verify_password(password, stored)
+
+    async def pooled_login() -> None:
+        valid, _ = await security_manager.verify_and_update(password, stored)
+        assert valid
+
+    print(f"bcrypt cost {args.rounds}, {args.logins} logins, concurrency {args.concurrency}, {args.workers} {args.executor} workers")
+    await run("before", inline_login, args.logins, args.concurrency)
+    await run("after", pooled_login, args.logins, args.concurrency)
+
+    security_manager.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
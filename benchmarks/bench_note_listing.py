@@ -0,0 +1,156 @@
+"""Note listing and search: ORM + pydantic read path versus column projection + msgspec structs.
+
+Seeds a throwaway user with --notes notes in the configured database (DATABASE_URL),
+times both read paths page by page including JSON encoding, reports rows/s and the
+peak memory allocated per page, then deletes the seeded rows.
+
+    python -m benchmarks.bench_note_listing --notes 5000 --page 50 --pages 40
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from litestar.serialization import encode_json
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import selectinload
+
+from app.Database.connection import close_db, get_session, init_db
+from app.DTOs.notes_dto import NotesRecord, NotesResponseDTO, NotesSearchRecord
+from app.Models.notes import Notes
+from app.Models.user import User
+from controller.notes import NOTE_COLUMNS, SEARCH_HEADLINE_OPTIONS, notes_search_vector, search_config
+from utils.security import security_manager
+
+WORDS = "hari ini aku merasa senang sedih lelah bahagia kerja kuliah teman keluarga rumah hujan".split()
+
+class NotesSearchResultDTO(NotesResponseDTO):
+    """The pydantic search-hit DTO the API used before NotesSearchRecord, kept as the baseline"""
+    rank: float
+    snippet: str
+
+    @classmethod
+    def from_row(cls, note: Notes, rank: float, snippet: str) -> "NotesSearchResultDTO":
+        return cls(
+            id_notes=note.id_notes,
+            id_user=note.id_user,
+            title=note.title,
+            content=note.content,
+            created_at=note.created_at,
+            updated_at=note.updated_at,
+            rank=rank,
+            snippet=snippet
+        )
+
+async def seed(count: int) -> uuid.UUID:
+    uid = uuid.uuid4()
+    now = datetime.now()
+
+    async with get_session() as session:
+        session.add(User(
+            uid=uid,
+            email=f"bench-{uid.hex[:12]}@example.com",
+            password=security_manager.get_password_hash("Benchmark#2024"),
+            nama="Benchmark",
+            tipe_keperibadian="INTJ",
+        ))
+        await session.flush()
+
+        rows = [{
+            "id_user": uid,
+            "title": f"Catatan {i}",
+            "content": " ".join(WORDS[(i + j) % len(WORDS)] for j in range(60)),
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now - timedelta(minutes=i),
+        } for i in range(count)]
+        await session.execute(insert(Notes), rows)
+        await session.commit()
+
+    return uid
+
+async def cleanup(uid: uuid.UUID) -> None:
+    async with get_session() as session:
+        await session.execute(delete(Notes).where(Notes.id_user == uid))
+        await session.execute(delete(User).where(User.uid == uid))
+        await session.commit()
+
+async def listing_orm(session, uid, page, offset) -> bytes:
+    query = (
+        select(Notes).options(selectinload(Notes.user)).where(Notes.id_user == uid)
+        .order_by(Notes.created_at.desc(), Notes.id_notes.desc()).offset(offset).limit(page)
+    )
+    result = await session.execute(query)
+    return encode_json([NotesResponseDTO.from_orm(note) for note in result.scalars().all()])
+
+async def listing_projected(session, uid, page, offset) -> bytes:
+    query = (
+        select(*NOTE_COLUMNS).where(Notes.id_user == uid)
+        .order_by(Notes.created_at.desc(), Notes.id_notes.desc()).offset(offset).limit(page)
+    )
+    result = await session.execute(query)
+    return encode_json([NotesRecord(*row) for row in result.tuples()])
+
+def search_query(uid, page, offset, *columns):
+    ts_query = func.websearch_to_tsquery(search_config, "senang")
+    rank = func.ts_rank_cd(notes_search_vector, ts_query)
+    ranked = (
+        select(Notes.id_notes, rank.label("rank"))
+        .where(notes_search_vector.op("@@")(ts_query), Notes.id_user == uid)
+        .order_by(rank.desc(), Notes.id_notes.desc()).offset(offset).limit(page).subquery()
+    )
+    snippet = func.ts_headline(search_config, Notes.content, ts_query, SEARCH_HEADLINE_OPTIONS)
+    return (
+        select(*columns, ranked.c.rank, snippet.label("snippet"))
+        .join(ranked, ranked.c.id_notes == Notes.id_notes)
+        .order_by(ranked.c.rank.desc(), Notes.id_notes.desc())
+    )
+
+async def search_orm(session, uid, page, offset) -> bytes:
+    result = await session.execute(search_query(uid, page, offset, Notes).options(selectinload(Notes.user)))
+    return encode_json([NotesSearchResultDTO.from_row(note, rank, snippet) for note, rank, snippet in result.all()])
+
+async def search_projected(session, uid, page, offset) -> bytes:
+    result = await session.execute(search_query(uid, page, offset, *NOTE_COLUMNS))
+    return encode_json([NotesSearchRecord(*row) for row in result.tuples()])
+
+async def measure(label: str, read_page, uid, page: int, pages: int) -> None:
+    async with get_session() as session:
+        await read_page(session, uid, page, 0)  # warm up statement caches
+
+        rows = 0
+        start = time.perf_counter()
+        for i in range(pages):
+            rows += (await read_page(session, uid, page, i * page)).count(b'"id_notes"')
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        await read_page(session, uid, page, 0)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        session.expunge_all()
+
+    print(f"{label:<22} {rows / elapsed:10.0f} rows/s   {peak / 1024:8.1f} KiB peak per page")
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=5000)
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=40)
+    args = parser.parse_args()
+
+    await init_db()
+    uid = await seed(args.notes)
+    try:
+        print(f"{args.notes} notes, {args.pages} pages of {args.page}")
+        await measure("listing before (ORM)", listing_orm, uid, args.page, args.pages)
+        await measure("listing after", listing_projected, uid, args.page, args.pages)
+        await measure("search before (ORM)", search_orm, uid, args.page, args.pages)
+        await measure("search after", search_projected, uid, args.page, args.pages)
+    finally:
+        await cleanup(uid)
+        await close_db()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""Startup cost: how long `import app` takes, and what a boot against the database costs.
+
+Each import is timed in a fresh interpreter, so nothing is already cached in sys.modules.
+--top lists the slowest modules from `python -X importtime`, which is where to look when
+the median regresses. --boot also runs the app's startup and shutdown hooks against the
+configured database (DATABASE_URL): the first boot on a new schema migrates, and later
+boots should only check the schema fingerprint.
+
+    python -m benchmarks.bench_startup --runs 5 --top 15 --boot
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = "import time; start = time.perf_counter(); import app; print(time.perf_counter() - start)"
+
+def time_import() -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+def slowest_imports(top: int) -> list:
+    """(cumulative seconds, module) for the slowest top-level imports under `import app`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented past the single leading space; only first-level ones are listed
+        if name.startswith("  "):
+            continue
+        entries.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(entries, reverse=True)[:top]
+
+async def time_boot() -> tuple:
+    from app import apps
+
+    start = time.perf_counter()
+    for hook in apps.on_startup:
+        result = hook()
+        if asyncio.iscoroutine(result):
+            await result
+    started = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for hook in apps.on_shutdown:
+        result = hook()
+        if asyncio.iscoroutine(result):
+            await result
+    return started, time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list; 0 to skip")
+    parser.add_argument("--boot", action="store_true", help="also run startup/shutdown hooks against the database")
+    args = parser.parse_args()
+
+    timings = [time_import() for _ in range(args.runs)]
+    print(
+        f"import app: median {statistics.median(timings) * 1000:.0f} ms, "
+        f"min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms over {args.runs} runs"
+    )
+
+    if args.top:
+        print("\nslowest imports (cumulative):")
+        for seconds, name in slowest_imports(args.top):
+            print(f"  {seconds * 1000:8.1f} ms  {name}")
+
+    if args.boot:
+        started, stopped = asyncio.run(time_boot())
+        print(f"\nstartup hooks {started * 1000:.0f} ms, shutdown hooks {stopped * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""End-to-end load test: latency percentiles and throughput per route under a realistic mix.
+
+Starts the app with uvicorn against the configured database (DATABASE_URL; use a scratch
+database, test users and notes are left behind) with LLM_BACKEND=fake and rate limiting
+off, so nothing leaves the machine. The local classifier is off too (--local-classifier
+turns it back on), so inference numbers measure the LLM path; inference texts also avoid
+the classifier's lexicon, and the tier that answered each call is reported. Pass --url to
+drive a server that is already running instead. Each virtual user registers, logs in, writes a few notes, then loops over a
+weighted mix of note CRUD, listing, search and inference calls for --duration seconds;
+that is repeated at every --concurrency level.
+
+Results are written as JSON with --output. Given --baseline (an earlier --output file),
+every route whose p95 grew or whose throughput fell by more than --tolerance is listed
+and the exit status is 1, so it can gate a deploy.
+
+    python -m benchmarks.load_test --concurrency 10,50 --duration 30 --output load.json
+    python -m benchmarks.load_test --concurrency 10,50 --duration 30 --baseline load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PASSWORD = "Load-test-1!"
+
+WORDS = (
+    "senang", "sedih", "kuliah", "teman", "keluarga", "kerja", "hujan", "lelah", "rindu", "marah",
+    "tenang", "ujian", "liburan", "makan", "tidur", "olahraga", "musik", "takut", "bangga", "cemas",
+)
+
+# Inference texts: no words from services/emotion_classifier.LEXICON, so a server with the
+# local classifier on still escalates them to the LLM
+NEUTRAL_WORDS = (
+    "meja", "buku", "jalan", "kota", "pagi", "siang", "kantor", "rumah", "pintu", "kertas",
+    "layar", "kopi", "kereta", "pasar", "taman", "lampu", "jendela", "sepeda", "telepon", "sore",
+)
+
+# (action, weight): mostly reads, as the app sees them
+DEFAULT_MIX = (
+    ("list_notes", 30),
+    ("get_note", 20),
+    ("search_notes", 15),
+    ("create_note", 12),
+    ("update_note", 8),
+    ("delete_note", 5),
+    ("inference", 10),
+)
+
+def sentence(rng: random.Random, words: int, vocabulary=WORDS) -> str:
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+class Recorder:
+    """Latencies and error counts per route for one concurrency level."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        # Which tier answered each inference call: llm, cache, local, or error
+        self.tiers: Counter = Counter()
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    async def call(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        self.latencies.setdefault(route, []).append(time.perf_counter() - start)
+
+        if response is None or response.status_code >= 400:
+            self.errors[route] = self.errors.get(route, 0) + 1
+            return None
+        return response
+
+    def summary(self) -> dict:
+        seconds = (self.finished or time.perf_counter()) - self.started
+        routes = {}
+        for route, latencies in sorted(self.latencies.items()):
+            ordered = sorted(latencies)
+            routes[route] = {
+                "requests": len(ordered),
+                "errors": self.errors.get(route, 0),
+                "rps": round(len(ordered) / seconds, 2),
+                "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+            }
+
+        total = sum(route["requests"] for route in routes.values())
+        return {
+            "seconds": round(seconds, 2),
+            "requests": total,
+            "errors": sum(route["errors"] for route in routes.values()),
+            "rps": round(total / seconds, 2) if seconds else 0.0,
+            "inference_tiers": dict(self.tiers),
+            "routes": routes,
+        }
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random, run_id: str, number: int):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.email = f"load-{run_id}-{number}@example.com"
+        self.uid: Optional[str] = None
+        self.headers: Dict[str, str] = {}
+        self.note_ids: List[int] = []
+
+    async def call(self, route: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        return await self.recorder.call(self.client, route, method, url, headers=self.headers, **kwargs)
+
+    async def setup(self, seed_notes: int) -> bool:
+        registered = await self.call("POST /api/register", "POST", "/api/register", json={
+            "email": self.email, "password": PASSWORD, "confirm_password": PASSWORD, "nama": "Load Test", "tipe_keperibadian": "INFP",
+        })
+        if registered is None:
+            return False
+
+        token = await self.call("POST /api/login", "POST", "/api/login", json={"credential": self.email, "password": PASSWORD})
+        if token is None:
+            return False
+
+        body = token.json()
+        self.uid = body["uid"]
+        self.headers = {"Authorization": f"Bearer {body['access_token']}"}
+
+        for _ in range(seed_notes):
+            await self.create_note()
+        return True
+
+    async def create_note(self) -> None:
+        response = await self.call("POST /api/notes/create", "POST", "/api/notes/create", json={
+            "title": sentence(self.rng, 3), "content": sentence(self.rng, 40), "id_user": self.uid,
+        })
+        if response is not None:
+            self.note_ids.append(response.json()["id_notes"])
+
+    async def list_notes(self) -> None:
+        await self.call("GET /api/notes/get_all", "GET", "/api/notes/get_all", params={"user_id": self.uid, "limit": 20})
+
+    async def get_note(self) -> None:
+        if self.note_ids:
+            note_id = self.rng.choice(self.note_ids)
+            await self.call("GET /api/notes/get_single/{note_id}", "GET", f"/api/notes/get_single/{note_id}")
+
+    async def search_notes(self) -> None:
+        await self.call("GET /api/notes/search", "GET", "/api/notes/search", params={"q": self.rng.choice(WORDS), "user_id": self.uid})
+
+    async def update_note(self) -> None:
+        if self.note_ids:
+            note_id = self.rng.choice(self.note_ids)
+            await self.call("PUT /api/notes/update/{note_id}", "PUT", f"/api/notes/update/{note_id}", json={"content": sentence(self.rng, 40)})
+
+    async def delete_note(self) -> None:
+        # Keep a few notes around for the reads
+        if len(self.note_ids) > 3:
+            note_id = self.note_ids.pop(self.rng.randrange(len(self.note_ids)))
+            await self.call("DELETE /api/notes/delete/{note_id}", "DELETE", f"/api/notes/delete/{note_id}")
+
+    async def inference(self) -> None:
+        response = await self.call(
+            "POST /api/inference", "POST", "/api/inference",
+            json={"text": sentence(self.rng, 25, NEUTRAL_WORDS), "id_user": self.uid},
+        )
+        if response is not None:
+            # Failures come back as 2xx with data.status 500 and no tier
+            self.recorder.tiers[response.json().get("data", {}).get("tier") or "error"] += 1
+
+    async def run(self, mix, deadline: float) -> None:
+        actions = [getattr(self, name) for name, _ in mix]
+        weights = [weight for _, weight in mix]
+        while time.perf_counter() < deadline:
+            await self.rng.choices(actions, weights)[0]()
+
+async def run_level(url: str, concurrency: int, duration: float, seed_notes: int, seed: int, mix) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        # Registration and the first notes are timed separately from the steady-state mix
+        setup = Recorder()
+        users = [VirtualUser(client, setup, random.Random(seed + number), run_id, number) for number in range(concurrency)]
+        ready = await asyncio.gather(*(user.setup(seed_notes) for user in users))
+        setup.finished = time.perf_counter()
+
+        users = [user for user, ok in zip(users, ready) if ok]
+        if not users:
+            raise SystemExit(f"No virtual user could register and log in against {url}")
+
+        steady = Recorder()
+        for user in users:
+            user.recorder = steady
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(user.run(mix, deadline) for user in users))
+        steady.finished = time.perf_counter()
+
+    return {"concurrency": concurrency, "users": len(users), "setup": setup.summary(), "steady": steady.summary()}
+
+def start_server(port: int, llm_latency_ms: float, llm_jitter_ms: float, local_classifier: bool) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        LLM_BACKEND="fake",
+        FAKE_LLM_LATENCY_MS=str(llm_latency_ms),
+        FAKE_LLM_JITTER_MS=str(llm_jitter_ms),
+        RATE_LIMIT_ENABLED="false",
+        LOCAL_CLASSIFIER_ENABLED=str(local_classifier).lower(),
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:apps", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+
+async def wait_until_ready(url: str, server: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=url, timeout=5) as client:
+        while time.perf_counter() < deadline:
+            if server.poll() is not None:
+                raise SystemExit(f"Server exited during startup with status {server.returncode}")
+            try:
+                if (await client.get("/api/health/db")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise SystemExit(f"Server at {url} was not ready after {timeout:.0f}s")
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Routes whose p95 grew, or whose throughput fell, by more than `tolerance` against the baseline."""
+    previous = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    regressions = []
+
+    for level in results["levels"]:
+        before = previous.get(level["concurrency"])
+        if before is None:
+            continue
+
+        for route, now in level["steady"]["routes"].items():
+            then = before["steady"]["routes"].get(route)
+            if then is None:
+                continue
+
+            label = f"c={level['concurrency']} {route}"
+            if then["p95_ms"] and now["p95_ms"] > then["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{label}: p95 {then['p95_ms']:.1f} -> {now['p95_ms']:.1f} ms")
+            if then["rps"] and now["rps"] < then["rps"] * (1 - tolerance):
+                regressions.append(f"{label}: {then['rps']:.1f} -> {now['rps']:.1f} req/s")
+
+    return regressions
+
+def print_level(level: dict) -> None:
+    steady = level["steady"]
+    print(
+        f"\nconcurrency {level['concurrency']}: {steady['requests']} requests in {steady['seconds']:.1f}s, "
+        f"{steady['rps']:.1f} req/s, {steady['errors']} errors"
+    )
+    print(f"  {'route':<40} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for route, stats in steady["routes"].items():
+        print(
+            f"  {route:<40} {stats['rps']:>8.1f} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} "
+            f"{stats['p99_ms']:>9.1f} {stats['errors']:>7}"
+        )
+
+    tiers = steady["inference_tiers"]
+    if tiers:
+        total = sum(tiers.values())
+        print("  inference answered by: " + ", ".join(
+            f"{tier} {count} ({count / total:.0%})" for tier, count in sorted(tiers.items(), key=lambda item: -item[1])
+        ))
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="drive a running server instead of starting one")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", default="10,50", help="comma-separated virtual user counts")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of steady traffic per level")
+    parser.add_argument("--seed-notes", type=int, default=5, help="notes each virtual user writes before the mix")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm-latency-ms", type=float, default=400)
+    parser.add_argument("--llm-jitter-ms", type=float, default=100)
+    parser.add_argument("--local-classifier", action="store_true", help="keep the local classifier tier on in the started server")
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    parser.add_argument("--baseline", default=None, help="earlier --output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression, e.g. 0.2 for 20%%")
+    args = parser.parse_args()
+
+    levels = [int(value) for value in args.concurrency.split(",") if value.strip()]
+
+    server = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        server = start_server(args.port, args.llm_latency_ms, args.llm_jitter_ms, args.local_classifier)
+
+    try:
+        if server is not None:
+            await wait_until_ready(url, server)
+
+        results = {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "url": url,
+            "duration": args.duration,
+            "mix": dict(DEFAULT_MIX),
+            "llm": {
+                "backend": "fake", "latency_ms": args.llm_latency_ms, "jitter_ms": args.llm_jitter_ms,
+                "local_classifier": args.local_classifier,
+            } if server else None,
+            "levels": [],
+        }
+        for concurrency in levels:
+            level = await run_level(url, concurrency, args.duration, args.seed_notes, args.seed, DEFAULT_MIX)
+            results["levels"].append(level)
+            print_level(level)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nresults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regressions against {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nno regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,14 +1,17 @@
-from litestar import Controller, post, get, put
+from litestar import Controller, Response, post, get, put
 from litestar.exceptions import HTTPException
 from litestar.status_codes import HTTP_200_OK
 from litestar.params import Body, Parameter
 from litestar.di import Provide
 
-from app.Database.connection import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Optional
+
 from app.Models.user import UserCreate, UserLogin, UserResponse, Token, User
 from services.auth_service import auth_service
 
 from utils.schema import UpdateUserData, RefreshTokenRequest
+from utils.etag import make_etag, etag_matches, etag_headers, not_modified
 
 class Authentication(Controller):
     path = "/api"
@@ -16,51 +19,62 @@ class Authentication(Controller):
     @post("/register")
     async def register(
         self,
+        db_session: AsyncSession,
         data: UserCreate = Body(),
     ) -> UserResponse:
-        async with get_session() as session:
-
-            user = await auth_service.register_user(data, session)
+        user = await auth_service.register_user(data, db_session)
 
-            return UserResponse(
-                uid=user.uid,
-                nama=user.nama,
-                email=user.email,
-                tipe_keperibadian=user.tipe_keperibadian,
-                is_active=user.is_active,
-                is_verified=user.is_verified,
-                created_at=user.created_at,
-                last_login=user.last_login
-            )
+        return UserResponse(
+            uid=user.uid,
+            nama=user.nama,
+            email=user.email,
+            tipe_keperibadian=user.tipe_keperibadian,
+            is_active=user.is_active,
+            is_verified=user.is_verified,
+            created_at=user.created_at,
+            last_login=user.last_login
+        )
     
     @post("/login")
     async def login(
         self,
+        db_session: AsyncSession,
         data: UserLogin = Body(),
     ) -> Token:
-        async with get_session() as session:
-            return await auth_service.authenticate_user(data, session)
+        return await auth_service.authenticate_user(data, db_session)
 
     @put("/edit_profile", status_code=HTTP_200_OK)
     async def edit_users(
         self,
+        db_session: AsyncSession,
         data: UpdateUserData = Body(),
     ) -> User:
-        async with get_session() as session:
-            return await auth_service.update_user_by_uid(data.uid, data, session)
+        return await auth_service.update_user_by_uid(data.uid, data, db_session)
 
     @get("/get_profile/{email:str}", status_code=HTTP_200_OK)
     async def get_users(
         self,
+        db_session: AsyncSession,
         email: str = Parameter(),
-    ) -> User:
-        async with get_session() as session:
-            return await auth_service.get_user_by_uid(email, session)
+        if_none_match: Optional[str] = Parameter(header="If-None-Match", default=None, required=False)
+    ) -> Response[User]:
+        if if_none_match:
+            version = await auth_service.get_user_version(email, db_session)
+            if version:
+                etag = make_etag([version])
+                if etag_matches(if_none_match, etag):
+                    return not_modified(etag)
+
+        user = await auth_service.get_user_by_uid(email, db_session)
+        if not user:
+            return Response(user)
+
+        return Response(user, headers=etag_headers(make_etag([(user.uid, user.updated_at)])))
 
     @post("/refresh")
     async def refresh_token(
         self,
+        db_session: AsyncSession,
         data: RefreshTokenRequest = Body(),
     ) -> Token:
-        async with get_session() as session:
-            return await auth_service.refresh_token(data, session)
\ No newline at end of file
+        return await auth_service.refresh_token(data, db_session)
@@ -0,0 +1,86 @@
+from litestar import Controller, Request, get, post
+from litestar.exceptions import NotFoundException
+from litestar.status_codes import HTTP_200_OK
+
+from sqlalchemy import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.Models.note_emotions import NoteEmotion
+from app.Models.notes import Notes
+from services.catalog import emotion_catalog
+from services.emotion_pipeline import emotion_pipeline
+from utils.guards import caller_uid, requires_admin, requires_auth
+
+class CatalogController(Controller):
+    path = "/api"
+    tags = ["Catalog"]
+    guards = [requires_auth]
+
+    @get("/emotions", status_code=HTTP_200_OK)
+    async def list_emotions(self) -> dict:
+        return {
+            "message": "Daftar emosi",
+            "data": emotion_catalog.emotions()
+        }
+
+    @get("/recommendations/{emotion:str}", status_code=HTTP_200_OK)
+    async def emotion_recommendations(self, emotion: str) -> dict:
+        entry = emotion_catalog.emotion(emotion)
+        if not entry:
+            raise NotFoundException(f"Emotion '{emotion}' not found")
+
+        return {
+            "message": "Rekomendasi untuk emosi",
+            "data": {
+                "emotion": entry._asdict(),
+                "recommendations": emotion_catalog.recommendations_for_id(entry.id_emotion)
+            }
+        }
+
+    @get("/recommendations/note/{note_id:int}", status_code=HTTP_200_OK)
+    async def note_recommendations(self, request: Request, db_session: AsyncSession, note_id: int) -> dict:
+        owner = await db_session.execute(select(Notes.id_user).where(Notes.id_notes == note_id))
+        if owner.scalar_one_or_none() != caller_uid(request):
+            raise NotFoundException(f"Note with ID {note_id} not found")
+
+        # The pipeline remembers recent results; only older notes need their emotion ids looked up
+        job = emotion_pipeline.status(note_id)
+        if job and job.get("status") == "done":
+            entries = [emotion_catalog.emotion(job["emotion"])]
+        else:
+            result = await db_session.execute(
+                select(NoteEmotion.id_emotion).where(NoteEmotion.id_notes == note_id).order_by(NoteEmotion.id_noteEmotions)
+            )
+            entries = [emotion_catalog.snapshot.emotions_by_id.get(id_emotion) for id_emotion in result.scalars().all()]
+
+        entries = [entry for entry in dict.fromkeys(entries) if entry]
+        if not entries:
+            raise NotFoundException(f"No analysed emotion for note with ID {note_id}")
+
+        return {
+            "message": "Rekomendasi untuk catatan",
+            "data": {
+                "id_notes": note_id,
+                "emotions": [
+                    {**entry._asdict(), "recommendations": emotion_catalog.recommendations_for_id(entry.id_emotion)}
+                    for entry in entries
+                ]
+            }
+        }
+
+    @get("/catalog/stats", status_code=HTTP_200_OK)
+    async def catalog_stats(self) -> dict:
+        return {
+            "message": "Statistik katalog emosi",
+            "data": emotion_catalog.stats()
+        }
+
+    @post("/catalog/reload", status_code=HTTP_200_OK, guards=[requires_admin])
+    async def reload_catalog(self) -> dict:
+        # Only reloads the worker that serves this request; other workers keep their snapshot
+        # until they restart or get their own reload
+        await emotion_catalog.load()
+        return {
+            "message": "Katalog emosi dimuat ulang",
+            "data": emotion_catalog.stats()
+        }
@@ -0,0 +1,15 @@
+from litestar import Controller, get
+from litestar.status_codes import HTTP_200_OK
+
+from app.Database.connection import pool_stats
+
+class HealthController(Controller):
+    path = "/api"
+    tags = ["Health"]
+
+    @get("/health/db", status_code=HTTP_200_OK)
+    async def database_pool(self) -> dict:
+        return {
+            "message": "Statistik connection pool database",
+            "data": pool_stats.snapshot()
+        }
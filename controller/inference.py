@@ -1,101 +1,135 @@
-from litestar import Controller, post, get, put
+from litestar import Controller, Request, post, get, put
 from litestar.exceptions import HTTPException
 from litestar.status_codes import HTTP_200_OK
 from litestar.params import Body, Parameter
 from litestar.di import Provide
+from litestar.response import ServerSentEvent, ServerSentEventMessage
 
 from app.Database.connection import get_session
+from app.Models.user import AuthenticatedUser
 from services.auth_service import auth_service
+from services.emotion_classifier import emotion_classifier
+from services.inference_cache import inference_cache
+from services.inference_service import inference_service, InferenceParseError
+from services.profile_service import profile_service
+from services.note_embeddings import related_snippets
+from services.catalog import emotion_catalog
+from app.Database.config import Config
 
-from langchain_openai import ChatOpenAI
 import json
-import re
+from typing import AsyncGenerator, List, Optional, Tuple
 from utils.schema import InferenceModelInput
+from utils.guards import caller_uid, requires_auth
 
 class InferenceModel(Controller):
     path = "/api"
+    guards = [requires_auth]
 
     @post("/inference")
-    async def inference(self, data: InferenceModelInput = Body()) -> dict:
+    async def inference(self, request: Request, data: InferenceModelInput = Body()) -> dict:
+        caller_uid(request, data.id_user)
         try:
-            llm = ChatOpenAI(
-                model="gpt-4o",
-                temperature=0.1,
-                max_tokens=1500,
-                top_p=0.85,
-            )
-
-            mbti_types = [
-                "INTJ", "INTP", "ENTJ", "ENTP",
-                "INFJ", "INFP", "ENFJ", "ENFP",
-                "ISTJ", "ISFJ", "ESTJ", "ESFJ",
-                "ISTP", "ISFP", "ESTP", "ESFP"
-            ]
-
-            plutchik_emotions = [
-                "anger", "anticipation", "disgust", "fear",
-                "joy", "sadness", "surprise", "trust"
-            ]
-
-            prompt = f"""
-                Kamu adalah seorang analis kepribadian dan emosi berdasarkan teks.
-
-                Berikut adalah input dari pengguna:
-                "{data.text}"
-
-                Berikut adalah catatan riwayat pengguna:
-                "{data.history_notes}"
-
-                Tugasmu adalah melakukan dua hal berikut:
-
-                1. Tentukan tipe kepribadian MBTI pengguna yang paling sesuai dari daftar berikut, berdasarkan pola berpikir, ekspresi, dan catatan historis:
-                {", ".join(mbti_types)}
-
-                2. Berdasarkan tipe kepribadian MBTI tersebut, analisis bagaimana tipe tersebut biasanya mengekspresikan emosi. Gunakan pemahaman tersebut untuk menafsirkan emosi dominan yang sedang dialami pengguna saat ini berdasarkan ekspresi teks mereka.
-
-                Pilih satu emosi utama dari daftar berikut:
-                {", ".join(plutchik_emotions)}
-
-                ⚠️ Catatan penting:
-                Jangan menilai emosi hanya dari kata-kata literal dalam input, tetapi sesuaikan juga dengan kecenderungan ekspresif dari tipe kepribadian yang telah kamu identifikasi. Misalnya, tipe INTJ mungkin menunjukkan kesedihan dengan kalimat yang tampak netral, sementara ENFP mungkin menunjukkannya dengan cara yang lebih ekspresif.
+            try:
+                history_notes, profile_mbti = await self._resolve_history(data, request.user)
+                parsed_result, tier = await inference_service.analyze(data.text, history_notes)
 
-                Berikan hasil akhir dalam format JSON **tanpa tambahan penjelasan atau blok markdown**, seperti berikut:
-                {{
-                "mbti": "<tipe MBTI>",
-                "emotion": "<emosi dominan>"
-                }}
-            """
+                return self._success_response(parsed_result, tier, profile_mbti)
 
+            except InferenceParseError as e:
+                return self._parse_error_response(e)
+        except Exception as e:
+            return self._error_response(e)
 
-            response = llm.invoke(prompt)
+    @post("/inference/stream")
+    async def inference_stream(self, request: Request, data: InferenceModelInput = Body()) -> ServerSentEvent:
+        caller_uid(request, data.id_user)
+        history_notes, profile_mbti = await self._resolve_history(data, request.user)
 
+        async def events() -> AsyncGenerator[ServerSentEventMessage, None]:
             try:
-                cleaned = re.sub(r"```json|```", "", response.content).strip()
-
-                parsed_result = json.loads(cleaned)
-
-                return {
-                    "message": "Analisis berhasil",
-                    "data": {
-                        "status": 200,
-                        "result": parsed_result
-                    }
-                }
-
-            except json.JSONDecodeError as e:
-                return {
-                    "message": "Gagal memproses hasil dari LLM",
-                    "data": {
-                        "status": 500,
-                        "error": str(e),
-                        "raw_response": response.content
-                    }
-                }
-        except Exception as e:
-            return {
-                "message": "Terjadi kesalahan saat melakukan inferensi",
-                "data": {
-                    "status": 500,
-                    "error": str(e)
-                }
-            }
\ No newline at end of file
+                async for event, payload in inference_service.stream(data.text, history_notes):
+                    if event == "result":
+                        payload = self._success_response(payload["result"], payload["tier"], profile_mbti)
+                    yield ServerSentEventMessage(event=event, data=json.dumps(payload))
+
+            except InferenceParseError as e:
+                yield ServerSentEventMessage(event="result", data=json.dumps(self._parse_error_response(e)))
+            except Exception as e:
+                yield ServerSentEventMessage(event="result", data=json.dumps(self._error_response(e)))
+
+        return ServerSentEvent(events())
+
+    @get("/inference/cache/stats", status_code=HTTP_200_OK)
+    async def cache_stats(self) -> dict:
+        return {
+            "message": "Statistik cache inferensi",
+            "data": inference_cache.stats()
+        }
+
+    @get("/inference/batch/stats", status_code=HTTP_200_OK)
+    async def batch_stats(self) -> dict:
+        return {
+            "message": "Statistik batching inferensi",
+            "data": inference_service.batcher.stats()
+        }
+
+    @get("/inference/classifier/stats", status_code=HTTP_200_OK)
+    async def classifier_stats(self) -> dict:
+        return {
+            "message": "Statistik klasifikasi emosi lokal",
+            "data": emotion_classifier.stats()
+        }
+
+    async def _resolve_history(self, data: InferenceModelInput, user: AuthenticatedUser) -> Tuple[Optional[List[str]], Optional[str]]:
+        """Prompt history and the caller's MBTI. Prefer the server-side profile; client-sent
+        history is only used for older clients. The MBTI is the profile's estimate, or the
+        type the user declared when nothing has been analysed yet.
+
+        Uses its own short session instead of a request-scoped one, so no pooled connection is
+        held while the LLM call runs (request dependencies are only cleaned up after the handler).
+        """
+        if not data.id_user:
+            return data.history_notes, user.tipe_keperibadian
+
+        async with get_session() as session:
+            profile = await profile_service.get_profile(data.id_user, session)
+            related = await related_snippets(data.id_user, data.text, Config.PROMPT_RELATED_NOTES, session)
+
+        history_notes = profile_service.build_context(profile, Config.PROMPT_HISTORY_TOKEN_BUDGET, related)
+        return history_notes, (profile.mbti if profile else None) or user.tipe_keperibadian
+
+    def _success_response(self, result: dict, tier: str, profile_mbti: Optional[str] = None) -> dict:
+        # The local classifier only answers the emotion; fall back to the caller's MBTI.
+        # "mbti" is only null when the user has neither a profile estimate nor a declared type
+        if result.get("mbti") is None and profile_mbti:
+            result = {**result, "mbti": profile_mbti}
+
+        return {
+            "message": "Analisis berhasil",
+            "data": {
+                "status": 200,
+                "result": result,
+                "tier": tier,
+                # Served from the in-memory catalog: no extra query per inference
+                "recommendations": emotion_catalog.recommendations_for(result.get("emotion"))
+            }
+        }
+
+    def _parse_error_response(self, e: InferenceParseError) -> dict:
+        return {
+            "message": "Gagal memproses hasil dari LLM",
+            "data": {
+                "status": 500,
+                "error": str(e),
+                "raw_response": e.raw_response
+            }
+        }
+
+    def _error_response(self, e: Exception) -> dict:
+        return {
+            "message": "Terjadi kesalahan saat melakukan inferensi",
+            "data": {
+                "status": 500,
+                "error": str(e)
+            }
+        }
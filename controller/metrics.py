@@ -0,0 +1,30 @@
+from litestar import Controller, get
+from litestar.status_codes import HTTP_200_OK
+
+from app.Database.connection import pool_stats
+from services.auth_cache import auth_cache
+from services.emotion_pipeline import emotion_pipeline
+from utils.metrics import render_metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class MetricsController(Controller):
+    path = "/metrics"
+    tags = ["Health"]
+    include_in_schema = False
+
+    @get("/", status_code=HTTP_200_OK, media_type=PROMETHEUS_CONTENT_TYPE)
+    async def metrics(self) -> str:
+        pool = pool_stats.snapshot()
+        pipeline = emotion_pipeline.stats()
+        auth = auth_cache.stats()
+
+        return render_metrics({
+            "moodiary_db_pool_size": ("Configured connection pool size", pool["size"]),
+            "moodiary_db_pool_checked_out": ("Connections currently checked out", pool["checked_out"]),
+            "moodiary_db_pool_overflow": ("Overflow connections currently open", pool["overflow"]),
+            "moodiary_db_pool_max_wait_seconds": ("Longest pool checkout wait since start", pool["max_wait_ms"] / 1000),
+            "moodiary_emotion_queue_depth": ("Notes waiting for emotion analysis", pipeline["queued"]),
+            "moodiary_auth_cache_users": ("Users held in the auth cache", auth["users"]),
+            "moodiary_auth_cache_hit_ratio": ("Share of authenticated requests served without a user lookup", auth["hit_ratio"]),
+        })
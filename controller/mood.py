@@ -0,0 +1,51 @@
+from litestar import Controller, Request, get
+from litestar.exceptions import ValidationException
+from litestar.status_codes import HTTP_200_OK
+
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from services.mood_rollup import mood_rollup_service, default_range
+from utils.guards import caller_uid, requires_auth
+
+# Longest range one timeline request may cover, keeping the read bounded
+MAX_TIMELINE_DAYS = 366
+
+class MoodController(Controller):
+    path = "/api"
+    tags = ["Mood"]
+    guards = [requires_auth]
+
+    @get("/mood/timeline", status_code=HTTP_200_OK)
+    async def mood_timeline(
+        self,
+        request: Request,
+        db_session: AsyncSession,
+        user_id: Optional[UUID] = None, # defaults to the caller; anyone else's id is refused
+        period: str = "day", # "day" or "week"
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> dict:
+
+        user_id = caller_uid(request, user_id)
+        start, end = default_range(period, start, end)
+        if start > end or (end - start).days >= MAX_TIMELINE_DAYS:
+            raise ValidationException(f"start must be before end and at most {MAX_TIMELINE_DAYS} days apart")
+
+        try:
+            timeline = await mood_rollup_service.timeline(user_id, period, start, end, db_session)
+        except ValueError as e:
+            raise ValidationException(str(e))
+
+        return {
+            "message": "Timeline suasana hati",
+            "data": {
+                "period": period,
+                "start": start,
+                "end": end,
+                "timeline": timeline
+            }
+        }
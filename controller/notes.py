@@ -1,188 +1,550 @@
-from litestar import Controller, get, post, put, delete
+from litestar import Controller, Request, Response, get, post, put, delete
+from litestar.response import Stream
 from litestar.exceptions import NotFoundException, ValidationException
 from litestar.status_codes import HTTP_201_CREATED, HTTP_200_OK
 from litestar.params import Body, Parameter
 
 from typing import List, Optional
-from sqlalchemy import select, update, delete as sql_delete
-from sqlalchemy.orm import selectinload
+from sqlalchemy import (
+    select, insert, update, delete as sql_delete, tuple_, func, cast, literal, literal_column,
+    values, column, bindparam, any_, Integer, String, Text
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR, ARRAY
+from sqlalchemy.exc import IntegrityError
 
 from app.Models.notes import Notes
-from app.DTOs.notes_dto import NotesCreateDTO, NotesUpdateDTO, NotesResponseDTO
-from app.Database.connection import get_session
+from app.DTOs.notes_dto import NotesCreateDTO, NotesUpdateDTO, NotesResponseDTO, NotesSimilarDTO
+from app.DTOs.notes_dto import NotesRecord, NotesSearchRecord
+from app.DTOs.notes_dto import (
+    NotesBulkCreateDTO, NotesBulkUpdateDTO, NotesBulkItemResultDTO, NotesBulkResultDTO, BULK_MAX_ITEMS
+)
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime
 
 from app.Models.user import User
+from app.Models.note_emotions import NoteEmotion
+from app.Models.emotions import Emotion
+from services.emotion_pipeline import emotion_pipeline
+from services.note_events import note_events
+from services.note_export import export_notes, EXPORT_FORMATS
+from services.note_import import import_notes, IMPORT_FORMATS
+from services.note_embeddings import note_vector_store
+from utils.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER, RANK_CURSOR, TIMESTAMP_CURSOR
+
+from app.Database.config import Config
+from utils.schema import DeleteRequest
+from utils.guards import caller_uid, requires_auth
+from utils.etag import make_etag, etag_matches, etag_headers, not_modified
 
 from uuid import UUID
 
+# Generated column maintained by Postgres (see app/Database/migrations.py), deliberately not mapped on Notes
+notes_search_vector = literal_column("notes.search_vector", TSVECTOR)
+search_config = cast(literal(Config.SEARCH_TEXT_CONFIG), REGCONFIG)
+SEARCH_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8"
+
+NOTE_COLUMNS = (Notes.id_notes, Notes.id_user, Notes.title, Notes.content, Notes.created_at, Notes.updated_at)
+
+def bulk_report(results: List[NotesBulkItemResultDTO]) -> NotesBulkResultDTO:
+    succeeded = sum(1 for item in results if item.status != "failed")
+    return NotesBulkResultDTO(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
 class NotesController(Controller):
     path = "/api"
     tags = ["Notes"]
+    guards = [requires_auth]
 
     @post("/notes/create", status_code=HTTP_201_CREATED)
     async def create_note(
         self, 
+        request: Request,
+        db_session: AsyncSession,
         data: NotesCreateDTO,
     ) -> NotesResponseDTO:
         
-        async with get_session() as db_session:
+        caller_uid(request, data.id_user)
+        now = datetime.now()
+        stmt = (
+            insert(Notes)
+            .values(title=data.title, content=data.content, id_user=data.id_user, created_at=now, updated_at=now)
+            .returning(*NOTE_COLUMNS)
+        )
 
-            try:
-                # Verify user exists (optional validation)
-                user_query = select(User).where(User.uid == data.id_user)
-                user_result = await db_session.exec(user_query)
-                if not user_result.first():
-                    raise ValidationException("User not found")
-
-                # Create new note
-                new_note = Notes(
-                    title=data.title,
-                    content=data.content,
-                    id_user=data.id_user
-                )
-                
-                db_session.add(new_note)
-                await db_session.commit()
-                await db_session.refresh(new_note)
-                
-                return NotesResponseDTO.from_orm(new_note)
-                
-            except Exception as e:
-                await db_session.rollback()
-                raise ValidationException(f"Failed to create note: {str(e)}")
+        try:
+            # The notes.id_user foreign key does the user check in the same statement
+            result = await db_session.execute(stmt)
+            new_note = result.one()
+            await db_session.commit()
+        except IntegrityError:
+            await db_session.rollback()
+            raise ValidationException("Failed to create note: User not found")
+        except Exception as e:
+            await db_session.rollback()
+            raise ValidationException(f"Failed to create note: {str(e)}")
+
+        # Profile, embedding and emotion tagging run in the background so the write returns immediately
+        note_events.written([new_note], is_new=True)
+
+        return NotesResponseDTO.from_orm(new_note)
 
     @get("/notes/get_all")
     async def get_all_notes(
         self,
-        user_id: Optional[UUID] = None,
+        request: Request,
+        db_session: AsyncSession,
+        user_id: Optional[UUID] = None, # defaults to the caller; anyone else's id is refused
         limit: int = 50,
-        offset: int = 0
-    ) -> List[NotesResponseDTO]:
+        offset: int = 0,
+        after: Optional[str] = None, # cursor from the previous page's X-Next-Cursor header
+        if_none_match: Optional[str] = Parameter(header="If-None-Match", default=None, required=False)
+    ) -> Response[List[NotesRecord]]:
+
+        user_id = caller_uid(request, user_id)
+
+        def page_query(*columns):
+            query = select(*columns).where(Notes.id_user == user_id)
+
+            if after:
+                created_at, last_id = decode_cursor(after, TIMESTAMP_CURSOR)
+                query = query.where(tuple_(Notes.created_at, Notes.id_notes) < tuple_(created_at, last_id))
+            else:
+                query = query.offset(offset)
+
+            return query.limit(limit).order_by(Notes.created_at.desc(), Notes.id_notes.desc())
+
+        if if_none_match:
+            # Revalidation only needs ids and timestamps, not note content
+            result = await db_session.execute(page_query(Notes.id_notes, Notes.updated_at))
+            etag = make_etag(result.all())
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
         
-        async with get_session() as db_session:
-
-            query = select(Notes).options(selectinload(Notes.user))
-            
-            if user_id:
-                query = query.where(Notes.id_user == user_id)
-                
-            query = query.limit(limit).offset(offset).order_by(Notes.created_at.desc())
-            
-            result = await db_session.exec(query)
-            notes = result.scalars().all()
-            
-            return [NotesResponseDTO.from_orm(note) for note in notes]
+        # Plain column rows straight into msgspec structs: no ORM identity map, no pydantic copy
+        result = await db_session.execute(page_query(*NOTE_COLUMNS))
+        notes = [NotesRecord(*row) for row in result.tuples()]
+
+        headers = etag_headers(make_etag((note.id_notes, note.updated_at) for note in notes))
+        if notes and len(notes) == limit:
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(notes[-1].created_at, notes[-1].id_notes)
+        
+        return Response(notes, headers=headers)
+
+    @get("/notes/export")
+    async def export_user_notes(
+        self,
+        request: Request,
+        user_id: Optional[UUID] = None, # defaults to the caller; anyone else's id is refused
+        format: str = "ndjson", # "ndjson" or "csv"
+        emotions: bool = False
+    ) -> Stream:
+
+        user_id = caller_uid(request, user_id)
+        if format not in EXPORT_FORMATS:
+            raise ValidationException(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+        return Stream(
+            export_notes(user_id, format, emotions, Config.EXPORT_CHUNK_SIZE),
+            media_type=EXPORT_FORMATS[format],
+            headers={"Content-Disposition": f'attachment; filename="notes-{user_id}.{format}"'}
+        )
+
+    @post("/notes/import", status_code=HTTP_200_OK, request_max_body_size=Config.IMPORT_MAX_BODY_BYTES)
+    async def import_user_notes(
+        self,
+        request: Request,
+        format: str = "ndjson", # "ndjson" or "csv"; the body is the raw file
+        user_id: Optional[UUID] = None, # defaults to the caller; anyone else's id is refused
+        analyze: bool = False
+    ) -> dict:
+
+        if format not in IMPORT_FORMATS:
+            raise ValidationException(f"format must be one of {', '.join(IMPORT_FORMATS)}")
+
+        # Every row is owned by the caller; rows naming another id_user are reported as failed
+        owner = caller_uid(request, user_id)
+
+        # The body is consumed as it arrives; rows are validated and COPYed batch by batch
+        report = await import_notes(request.stream(), format, owner, Config.IMPORT_BATCH_SIZE, analyze, owner=owner)
+
+        return {
+            "message": "Import catatan selesai",
+            "data": report
+        }
 
     @get("/notes/get_single/{note_id:int}")
     async def get_note_by_id(
         self, 
+        request: Request,
+        db_session: AsyncSession,
         note_id: int,
-    ) -> NotesResponseDTO:
+        if_none_match: Optional[str] = Parameter(header="If-None-Match", default=None, required=False)
+    ) -> Response[NotesRecord]:
+
+        # Other users' notes are reported as missing, not forbidden, so ids can't be probed
+        owned = (Notes.id_notes == note_id, Notes.id_user == caller_uid(request))
+
+        if if_none_match:
+            result = await db_session.execute(
+                select(Notes.id_notes, Notes.updated_at).where(*owned)
+            )
+            version = result.first()
+            if version:
+                etag = make_etag([version])
+                if etag_matches(if_none_match, etag):
+                    return not_modified(etag)
+        
+        query = select(*NOTE_COLUMNS).where(*owned)
+        
+        result = await db_session.execute(query)
+        row = result.first()
         
-        async with get_session() as db_session:
+        if not row:
+            raise NotFoundException(f"Note with ID {note_id} not found")
 
-            query = select(Notes).options(
-                selectinload(Notes.user),
-                selectinload(Notes.note_emotions)
-            ).where(Notes.id_notes == note_id)
-            
-            result = await db_session.exec(query)
-            note = result.scalars().first()
-            
-            if not note:
-                raise NotFoundException(f"Note with ID {note_id} not found")
-                
-            return NotesResponseDTO.from_orm(note)
+        note = NotesRecord(*row)
+        etag = make_etag([(note.id_notes, note.updated_at)])
+        return Response(note, headers=etag_headers(etag))
+
+    @get("/notes/analysis/{note_id:int}")
+    async def get_note_analysis(
+        self,
+        request: Request,
+        db_session: AsyncSession,
+        note_id: int,
+    ) -> dict:
+
+        owner = await db_session.execute(select(Notes.id_user).where(Notes.id_notes == note_id))
+        if owner.scalar_one_or_none() != caller_uid(request):
+            raise NotFoundException(f"Note with ID {note_id} not found")
+
+        job = emotion_pipeline.status(note_id)
+        if job:
+            return job
+
+        # No job in memory (e.g. after a restart): fall back to what is stored
+        query = select(Emotion.tipe_emosi).join(
+            NoteEmotion, NoteEmotion.id_emotion == Emotion.id_emotion
+        ).where(NoteEmotion.id_notes == note_id)
+
+        result = await db_session.exec(query)
+        emotions = result.scalars().all()
+
+        if not emotions:
+            raise NotFoundException(f"No analysis found for note with ID {note_id}")
+
+        return {
+            "id_notes": note_id,
+            "status": "done",
+            "emotion": emotions[-1],
+            "emotions": list(emotions)
+        }
+
+    @get("/notes/analysis/stats")
+    async def get_analysis_stats(self) -> dict:
+        return emotion_pipeline.stats()
 
     @put("/notes/update/{note_id:int}")
     async def update_note(
         self,
+        request: Request,
+        db_session: AsyncSession,
         note_id: int,
         data: NotesUpdateDTO,
     ) -> NotesResponseDTO:
 
-        async with get_session() as db_session:
-            # Cek apakah note ada
-            query = select(Notes).where(Notes.id_notes == note_id)
-            result = await db_session.exec(query)
-            note = result.scalars().first()
-
-            if not note:
-                raise NotFoundException(f"Note with ID {note_id} not found")
+        update_data = data.model_dump(exclude_unset=True, exclude_none=True)
+        owned = (Notes.id_notes == note_id, Notes.id_user == caller_uid(request))
 
-            # Update fields
-            update_data = data.model_dump(exclude_unset=True, exclude_none=True)
-            if update_data:
-                update_data['updated_at'] = datetime.now()
-                stmt = (
-                    update(Notes)
-                    .where(Notes.id_notes == note_id)
-                    .values(**update_data)
-                )
-                await db_session.exec(stmt)
-                await db_session.commit()
+        if update_data:
+            update_data['updated_at'] = datetime.now()
+            stmt = (
+                update(Notes)
+                .where(*owned)
+                .values(**update_data)
+                .returning(*NOTE_COLUMNS)
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            stmt = select(*NOTE_COLUMNS).where(*owned)
 
-                # Ambil ulang dari DB sebagai ORM instance
-                updated_note = await db_session.get(Notes, note_id)
-                if not updated_note:
-                    raise NotFoundException(detail="Updated note not found")
+        result = await db_session.execute(stmt)
+        note = result.first()
 
-                return NotesResponseDTO.from_orm(updated_note)
+        if not note:
+            raise NotFoundException(f"Note with ID {note_id} not found")
 
-            return NotesResponseDTO.from_orm(note)
+        if update_data:
+            await db_session.commit()
+            note_events.written([note], is_new=False)
 
+        return NotesResponseDTO.from_orm(note)
 
     @delete("/notes/delete/{note_id:int}", status_code=HTTP_200_OK)
     async def delete_note(
         self,
+        request: Request,
+        db_session: AsyncSession,
         note_id: int,
     ) -> None:
-        
-        async with get_session() as db_session:
 
-            # Check if note exists
-            query = select(Notes).where(Notes.id_notes == note_id)
+        # note_emotions rows go with the note via ON DELETE CASCADE
+        stmt = (
+            sql_delete(Notes)
+            .where(Notes.id_notes == note_id, Notes.id_user == caller_uid(request))
+            .returning(Notes.id_notes, Notes.id_user)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db_session.execute(stmt)
+        note = result.first()
+
+        if not note:
+            raise NotFoundException(f"Note with ID {note_id} not found")
+
+        await db_session.commit()
+        note_events.deleted([note])
+
+        return {
+            "message": f"Data dengan ID Notes {note_id} berhasil di hapus"
+        }
+
+    @get("/notes/similar")
+    async def similar_notes(
+        self,
+        request: Request,
+        db_session: AsyncSession,
+        user_id: Optional[UUID] = None, # defaults to the caller; anyone else's id is refused
+        note_id: Optional[int] = None,
+        text: Optional[str] = None,
+        k: int = Parameter(default=5, ge=1, le=Config.SIMILAR_NOTES_MAX_K)
+    ) -> List[NotesSimilarDTO]:
+
+        user_id = caller_uid(request, user_id)
+
+        if not note_id and not (text and text.strip()):
+            raise ValidationException("Provide either note_id or text")
+
+        if note_id:
+            query = select(Notes).where(Notes.id_notes == note_id, Notes.id_user == user_id)
             result = await db_session.exec(query)
-            note = result.first()
-            
+            note = result.scalars().first()
+
             if not note:
                 raise NotFoundException(f"Note with ID {note_id} not found")
-            
-            # Delete the note
-            stmt = sql_delete(Notes).where(Notes.id_notes == note_id)
-            await db_session.exec(stmt)
-            await db_session.commit()
 
-            return {
-                "message": f"Data dengan ID Notes {note_id} berhasil di hapus"
-            }
+            text = f"{note.title}\n{note.content}"
+
+        matches = await note_vector_store.search(user_id, text, k, exclude_id=note_id)
+        if not matches:
+            return []
+
+        query = select(Notes).where(Notes.id_notes.in_([match_id for match_id, _ in matches]), Notes.id_user == user_id)
+        result = await db_session.exec(query)
+        notes = {note.id_notes: note for note in result.scalars().all()}
+
+        return [
+            NotesSimilarDTO.from_match(notes[match_id], score)
+            for match_id, score in matches if match_id in notes
+        ]
+
+    @post("/notes/bulk/create", status_code=HTTP_200_OK)
+    async def bulk_create_notes(
+        self,
+        request: Request,
+        db_session: AsyncSession,
+        data: NotesBulkCreateDTO,
+    ) -> NotesBulkResultDTO:
+
+        # One lookup for every owner instead of one per note; all of them must be the caller
+        user_ids = {item.id_user for item in data.notes}
+        for id_user in user_ids:
+            caller_uid(request, id_user)
+        user_result = await db_session.exec(select(User.uid).where(User.uid.in_(user_ids)))
+        existing_users = set(user_result.scalars().all())
+
+        results = [None] * len(data.notes)
+        rows, row_indexes = [], []
+        now = datetime.now()
+
+        for index, item in enumerate(data.notes):
+            if item.id_user not in existing_users:
+                results[index] = NotesBulkItemResultDTO(index=index, status="failed", error="User not found")
+                continue
+
+            rows.append({
+                "title": item.title,
+                "content": item.content,
+                "id_user": item.id_user,
+                "created_at": now,
+                "updated_at": now
+            })
+            row_indexes.append(index)
+
+        created = []
+        if rows:
+            stmt = insert(Notes).returning(*NOTE_COLUMNS, sort_by_parameter_order=True)
+            result = await db_session.execute(stmt, rows)
+            created = result.all()
+
+        await db_session.commit()
+        note_events.written(created, is_new=True)
+
+        for index, note in zip(row_indexes, created):
+            results[index] = NotesBulkItemResultDTO(index=index, id_notes=note.id_notes, status="created")
+
+        return bulk_report(results)
+
+    @put("/notes/bulk/update")
+    async def bulk_update_notes(
+        self,
+        request: Request,
+        db_session: AsyncSession,
+        data: NotesBulkUpdateDTO,
+    ) -> NotesBulkResultDTO:
+
+        results = [None] * len(data.notes)
+        latest = {}
+
+        for index, item in enumerate(data.notes):
+            if item.title is None and item.content is None:
+                results[index] = NotesBulkItemResultDTO(index=index, id_notes=item.id_notes, status="failed", error="Nothing to update")
+                continue
+
+            # Later entries for the same note win
+            if item.id_notes in latest:
+                previous = latest[item.id_notes]
+                results[previous] = NotesBulkItemResultDTO(index=previous, id_notes=item.id_notes, status="superseded")
+            latest[item.id_notes] = index
+
+        updated = []
+        if latest:
+            changes = values(
+                column("id_notes", Integer),
+                column("title", String),
+                column("content", Text),
+                name="changes"
+            ).data([
+                (data.notes[index].id_notes, data.notes[index].title, data.notes[index].content)
+                for index in latest.values()
+            ])
+
+            stmt = (
+                update(Notes)
+                .where(Notes.id_notes == changes.c.id_notes, Notes.id_user == caller_uid(request))
+                .values(
+                    title=func.coalesce(changes.c.title, Notes.title),
+                    content=func.coalesce(changes.c.content, Notes.content),
+                    updated_at=datetime.now()
+                )
+                .returning(*NOTE_COLUMNS)
+                .execution_options(synchronize_session=False)
+            )
+            result = await db_session.execute(stmt)
+            updated = result.all()
+
+        await db_session.commit()
+        note_events.written(updated, is_new=False)
+
+        updated_ids = {note.id_notes for note in updated}
+        for note_id, index in latest.items():
+            if note_id in updated_ids:
+                results[index] = NotesBulkItemResultDTO(index=index, id_notes=note_id, status="updated")
+            else:
+                results[index] = NotesBulkItemResultDTO(index=index, id_notes=note_id, status="failed", error="Note not found")
+
+        return bulk_report(results)
+
+    @post("/notes/bulk/delete", status_code=HTTP_200_OK)
+    async def bulk_delete_notes(
+        self,
+        request: Request,
+        db_session: AsyncSession,
+        data: DeleteRequest,
+    ) -> NotesBulkResultDTO:
+
+        raw_ids = [data.ids] if isinstance(data.ids, str) else data.ids
+        if not raw_ids or len(raw_ids) > BULK_MAX_ITEMS:
+            raise ValidationException(f"Provide between 1 and {BULK_MAX_ITEMS} ids")
+
+        results = [None] * len(raw_ids)
+        note_ids = {}
+
+        for index, raw_id in enumerate(raw_ids):
+            try:
+                note_ids.setdefault(int(raw_id), []).append(index)
+            except ValueError:
+                results[index] = NotesBulkItemResultDTO(index=index, status="failed", error=f"Invalid note id '{raw_id}'")
+
+        deleted = []
+        if note_ids:
+            # note_emotions rows go with their notes via ON DELETE CASCADE
+            stmt = (
+                sql_delete(Notes)
+                .where(
+                    Notes.id_notes == any_(bindparam("note_ids", list(note_ids), type_=ARRAY(Integer))),
+                    Notes.id_user == caller_uid(request)
+                )
+                .returning(Notes.id_notes, Notes.id_user)
+                .execution_options(synchronize_session=False)
+            )
+            result = await db_session.execute(stmt)
+            deleted = result.all()
+
+        await db_session.commit()
+        note_events.deleted(deleted)
+
+        deleted_ids = {note.id_notes for note in deleted}
+        for note_id, indexes in note_ids.items():
+            for index in indexes:
+                if note_id in deleted_ids:
+                    results[index] = NotesBulkItemResultDTO(index=index, id_notes=note_id, status="deleted")
+                else:
+                    results[index] = NotesBulkItemResultDTO(index=index, id_notes=note_id, status="failed", error="Note not found")
+
+        return bulk_report(results)
 
     @get("/notes/search")
     async def search_notes(
         self,
+        request: Request,
+        db_session: AsyncSession,
         q: str = None, # title or content
-        user_id: Optional[UUID] = None,
+        user_id: Optional[UUID] = None, # defaults to the caller; anyone else's id is refused
         limit: int = 10,
-        offset: int = 0
-    ) -> List[NotesResponseDTO]:
+        offset: int = 0,
+        after: Optional[str] = None # cursor from the previous page's X-Next-Cursor header
+    ) -> Response[List[NotesSearchRecord]]:
         
-        async with get_session() as db_session:
-
-            if not q or len(q.strip()) < 2:
-                raise ValidationException("Search query must be at least 2 characters")
-            
-            search_term = f"%{q.strip()}%"
-            query = select(Notes).options(selectinload(Notes.user)).where(
-                (Notes.title.ilike(search_term)) | (Notes.content.ilike(search_term))
-            )
-            
-            if user_id:
-                query = query.where(Notes.id_user == user_id)
-                
-            query = query.limit(limit).offset(offset).order_by(Notes.updated_at.desc())
-            
-            result = await db_session.exec(query)
-            notes = result.scalars().all()
-            
-            return [NotesResponseDTO.from_orm(note) for note in notes]
\ No newline at end of file
+        if not q or len(q.strip()) < 2:
+            raise ValidationException("Search query must be at least 2 characters")
+        
+        ts_query = func.websearch_to_tsquery(search_config, q.strip())
+        rank = func.ts_rank_cd(notes_search_vector, ts_query)
+
+        # Rank and paginate on the index first; headlines are built only for the page
+        ranked = select(Notes.id_notes, rank.label("rank")).where(
+            notes_search_vector.op("@@")(ts_query), Notes.id_user == caller_uid(request, user_id)
+        )
+
+        if after:
+            last_rank, last_id = decode_cursor(after, RANK_CURSOR)
+            ranked = ranked.where(tuple_(rank, Notes.id_notes) < tuple_(last_rank, last_id))
+        else:
+            ranked = ranked.offset(offset)
+
+        ranked = ranked.order_by(rank.desc(), Notes.id_notes.desc()).limit(limit).subquery()
+
+        snippet = func.ts_headline(search_config, Notes.content, ts_query, SEARCH_HEADLINE_OPTIONS)
+        query = (
+            select(*NOTE_COLUMNS, ranked.c.rank, snippet.label("snippet"))
+            .join(ranked, ranked.c.id_notes == Notes.id_notes)
+            .order_by(ranked.c.rank.desc(), Notes.id_notes.desc())
+        )
+        
+        result = await db_session.execute(query)
+        hits = [NotesSearchRecord(*row) for row in result.tuples()]
+
+        headers = {}
+        if hits and len(hits) == limit:
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(hits[-1].rank, hits[-1].id_notes)
+        
+        return Response(hits, headers=headers)
\ No newline at end of file
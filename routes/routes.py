@@ -1,5 +1,9 @@
 from controller.auth import Authentication
 from controller.notes import NotesController
 from controller.inference import InferenceModel
+from controller.health import HealthController
+from controller.metrics import MetricsController
+from controller.catalog import CatalogController
+from controller.mood import MoodController
 
-routes = [Authentication, NotesController, InferenceModel]
\ No newline at end of file
+routes = [Authentication, NotesController, InferenceModel, HealthController, MetricsController, CatalogController, MoodController]
\ No newline at end of file
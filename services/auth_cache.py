@@ -0,0 +1,85 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+from uuid import UUID
+
+from app.Database.config import Config
+from app.Models.user import AuthenticatedUser, TokenData
+from utils.security import security_manager
+
+class AuthCache:
+    """Short-lived in-process caches of verified access tokens and the users they belong to.
+
+    Entries expire after `ttl` seconds (tokens also at their own exp), so another worker's
+    changes are picked up within that window; changes made here are invalidated immediately.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._tokens: "OrderedDict[str, Tuple[TokenData, float]]" = OrderedDict()
+        self._users: "OrderedDict[UUID, Tuple[AuthenticatedUser, float]]" = OrderedDict()
+        self._tokens_by_user: Dict[UUID, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def verify_token(self, token: str) -> TokenData:
+        """security_manager.verify_token, skipping the signature check for recently verified tokens."""
+        now = time.time()
+        entry = self._tokens.get(token)
+        if entry and entry[1] > now:
+            self._tokens.move_to_end(token)
+            return entry[0]
+
+        token_data = security_manager.verify_token(token)
+
+        expires_at = now + self.ttl
+        if token_data.expires_at:
+            expires_at = min(expires_at, token_data.expires_at.timestamp())
+
+        self._tokens[token] = (token_data, expires_at)
+        self._tokens_by_user.setdefault(token_data.user_id, set()).add(token)
+        self._evict(self._tokens)
+        return token_data
+
+    def get_user(self, uid: UUID) -> Optional[AuthenticatedUser]:
+        entry = self._users.get(uid)
+        if entry and entry[1] > time.time():
+            self._users.move_to_end(uid)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        return None
+
+    def set_user(self, user: AuthenticatedUser) -> None:
+        self._users[user.uid] = (user, time.time() + self.ttl)
+        self._evict(self._users)
+
+    def invalidate_user(self, uid: UUID) -> None:
+        """Forget a user and every token cached for them, e.g. after a profile change or lockout."""
+        self._users.pop(uid, None)
+        for token in self._tokens_by_user.pop(uid, set()):
+            self._tokens.pop(token, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "tokens": len(self._tokens),
+            "users": len(self._users),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _evict(self, entries: OrderedDict) -> None:
+        while len(entries) > self.max_entries:
+            key, (value, _) = entries.popitem(last=False)
+            if entries is self._tokens:
+                tokens = self._tokens_by_user.get(value.user_id)
+                if tokens:
+                    tokens.discard(key)
+                    if not tokens:
+                        del self._tokens_by_user[value.user_id]
+
+auth_cache = AuthCache(ttl=Config.AUTH_CACHE_TTL_SECONDS, max_entries=Config.AUTH_CACHE_MAX_ENTRIES)
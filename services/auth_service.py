@@ -10,7 +10,9 @@ from litestar.status_codes import (
 
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from app.Models.user import User, UserCreate, UserLogin, Token
+from app.Models.user import User, UserCreate, UserLogin, Token, AuthenticatedUser
+from app.Database.connection import get_session
+from services.auth_cache import auth_cache
 from utils.security import security_manager
 from typing import Optional
 from uuid import UUID
@@ -52,7 +54,7 @@ class AuthService:
                 detail="Email already registered"
             )
         
-        hashed_password = security_manager.get_password_hash(user_data.password)
+        hashed_password = await security_manager.hash_password(user_data.password)
         
         db_user = User(
             nama=user_data.nama,
@@ -87,8 +89,11 @@ class AuthService:
                 detail=f"Account locked until {user.locked_until}"
             )
         
-        if not security_manager.verify_password(login_data.password, user.password):
+        valid, new_hash = await security_manager.verify_and_update(login_data.password, user.password)
+
+        if not valid:
             user.failed_login_attempts += 1
+            user.updated_at = datetime.now()
             
             if user.failed_login_attempts >= Config.MAX_LOGIN_ATTEMPTS:
                 user.locked_until = datetime.now() + timedelta(
@@ -96,6 +101,9 @@ class AuthService:
                 )
             
             await session.commit()
+
+            if user.locked_until:
+                auth_cache.invalidate_user(user.uid)
             raise HTTPException(
                 status_code=HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
@@ -107,6 +115,10 @@ class AuthService:
                 detail="Account deactivated"
             )
         
+        if new_hash:
+            # Stored hash used an outdated bcrypt cost; upgrade it now that we have the plain password
+            user.password = new_hash
+
         user.failed_login_attempts = 0
         user.locked_until = None
         user.last_login = datetime.now()
@@ -153,6 +165,11 @@ class AuthService:
         user = result.first()
         return user
     
+    async def get_user_version(self, email: str, session: AsyncSession) -> Optional[tuple]:
+        """(uid, updated_at) of a user, enough to revalidate a cached profile without loading it."""
+        result = await session.exec(select(User.uid, User.updated_at).where(User.email == email))
+        return result.first()
+
     async def update_user_by_uid(
         self,
         uid: UUID,
@@ -190,7 +207,7 @@ class AuthService:
                     status_code=HTTP_400_BAD_REQUEST,
                     detail="Password must be strong (min 8 chars, upper/lowercase, digit, symbol)"
                 )
-            user.password = security_manager.get_password_hash(data.password)
+            user.password = await security_manager.hash_password(data.password)
 
         if data.nama is not None:
             user.nama = data.nama
@@ -198,19 +215,55 @@ class AuthService:
         if data.tipe_keperibadian is not None:
             user.tipe_keperibadian = data.tipe_keperibadian
 
+        # Drives the profile ETag, so every committed change must bump it
+        user.updated_at = datetime.now()
+
         await session.commit()
         await session.refresh(user)
 
+        # Drop the cached snapshot and tokens so the guard sees the new email/password right away
+        auth_cache.invalidate_user(user.uid)
+
         return user
     
-    async def get_current_user(self, token: str, session: AsyncSession) -> User:
-        token_data = security_manager.verify_token(token)
-        
-        user = await self._get_user_by_email(token_data.email, session)
+    async def get_current_user(self, token: str, session: Optional[AsyncSession] = None) -> AuthenticatedUser:
+        """Resolve a bearer token to its user, from the auth cache when possible (no DB hit)."""
+        token_data = auth_cache.verify_token(token)
+
+        user = auth_cache.get_user(token_data.user_id)
         if not user:
+            if session is None:
+                async with get_session() as own_session:
+                    db_user = await self._get_user_by_uid(token_data.user_id, own_session)
+            else:
+                db_user = await self._get_user_by_uid(token_data.user_id, session)
+
+            if not db_user:
+                raise HTTPException(
+                    status_code=HTTP_401_UNAUTHORIZED,
+                    detail="User not found"
+                )
+
+            user = AuthenticatedUser.model_validate(db_user, from_attributes=True)
+            auth_cache.set_user(user)
+
+        # Tokens carry the email they were issued for; an email change retires them
+        if user.email != token_data.email:
             raise HTTPException(
                 status_code=HTTP_401_UNAUTHORIZED,
-                detail="User not found"
+                detail="Invalid token"
+            )
+
+        if not user.is_active:
+            raise HTTPException(
+                status_code=HTTP_403_FORBIDDEN,
+                detail="Account deactivated"
+            )
+
+        if user.locked_until and user.locked_until > datetime.now():
+            raise HTTPException(
+                status_code=HTTP_423_LOCKED,
+                detail=f"Account locked until {user.locked_until}"
             )
         
         return user
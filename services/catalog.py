@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from datetime import datetime
+from types import MappingProxyType
+from typing import List, Mapping, NamedTuple, Optional, Tuple
+
+from sqlmodel import select
+
+from app.Database.connection import get_session
+from app.Models.emotions import Emotion
+from app.Models.recomendastions import Recommendation
+
+logger = logging.getLogger(__name__)
+
+class EmotionEntry(NamedTuple):
+    id_emotion: int
+    tipe_emosi: str
+
+class RecommendationEntry(NamedTuple):
+    id_recc: int
+    id_emotion: int
+    recc_text: str
+
+class CatalogSnapshot(NamedTuple):
+    """One immutable version of the emotions and recommendations tables."""
+    version: int
+    loaded_at: Optional[datetime]
+    emotions_by_id: Mapping[int, EmotionEntry]
+    emotions_by_type: Mapping[str, EmotionEntry]  # keyed by lower-cased tipe_emosi
+    recommendations: Mapping[int, Tuple[RecommendationEntry, ...]]  # keyed by id_emotion
+
+EMPTY_SNAPSHOT = CatalogSnapshot(0, None, MappingProxyType({}), MappingProxyType({}), MappingProxyType({}))
+
+class EmotionCatalog:
+    """Reference data served from memory.
+
+    Readers always see one complete snapshot; `load` builds the next one and swaps it in,
+    bumping the version. Call it after changing either table (or POST /api/catalog/reload).
+    Snapshots are per process: a reload only refreshes the worker that runs it, and the
+    version is a local counter, not shared between workers.
+    """
+
+    def __init__(self):
+        self.snapshot = EMPTY_SNAPSHOT
+        self._lock = asyncio.Lock()
+
+    async def load(self) -> CatalogSnapshot:
+        async with self._lock:
+            async with get_session() as session:
+                emotions = (await session.exec(select(Emotion.id_emotion, Emotion.tipe_emosi))).all()
+                recommendations = (await session.exec(
+                    select(Recommendation.id_recc, Recommendation.id_emotion, Recommendation.recc_text)
+                    .order_by(Recommendation.id_recc)
+                )).all()
+
+            by_id = {row[0]: EmotionEntry(*row) for row in emotions}
+            grouped = {}
+            for row in recommendations:
+                grouped.setdefault(row[1], []).append(RecommendationEntry(*row))
+
+            self.snapshot = CatalogSnapshot(
+                version=self.snapshot.version + 1,
+                loaded_at=datetime.now(),
+                emotions_by_id=MappingProxyType(by_id),
+                emotions_by_type=MappingProxyType({entry.tipe_emosi.strip().lower(): entry for entry in by_id.values()}),
+                recommendations=MappingProxyType({id_emotion: tuple(items) for id_emotion, items in grouped.items()}),
+            )
+
+        logger.info(
+            "Emotion catalog v%s loaded: %s emotions, %s recommendations",
+            self.snapshot.version, len(by_id), len(recommendations)
+        )
+        return self.snapshot
+
+    def emotion(self, tipe_emosi: str) -> Optional[EmotionEntry]:
+        return self.snapshot.emotions_by_type.get((tipe_emosi or "").strip().lower())
+
+    def recommendations_for(self, tipe_emosi: str) -> List[dict]:
+        entry = self.emotion(tipe_emosi)
+        return self.recommendations_for_id(entry.id_emotion) if entry else []
+
+    def recommendations_for_id(self, id_emotion: int) -> List[dict]:
+        return [item._asdict() for item in self.snapshot.recommendations.get(id_emotion, ())]
+
+    def emotions(self) -> List[dict]:
+        return [entry._asdict() for entry in self.snapshot.emotions_by_id.values()]
+
+    def stats(self) -> dict:
+        snapshot = self.snapshot
+        return {
+            "version": snapshot.version,
+            "loaded_at": snapshot.loaded_at.isoformat() if snapshot.loaded_at else None,
+            "emotions": len(snapshot.emotions_by_id),
+            "recommendations": sum(len(items) for items in snapshot.recommendations.values()),
+        }
+
+emotion_catalog = EmotionCatalog()
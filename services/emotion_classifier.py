@@ -0,0 +1,210 @@
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlmodel import select
+
+from app.Database.config import Config
+from app.Database.connection import get_session
+
+logger = logging.getLogger(__name__)
+
+# Seed vocabulary (Indonesian and English) for the eight Plutchik emotions.
+LEXICON: Dict[str, List[str]] = {
+    "anger": [
+        "marah", "kesal", "jengkel", "geram", "murka", "sebal", "dongkol", "emosi",
+        "kesel", "ngamuk", "angry", "mad", "furious", "annoyed", "rage", "pissed",
+    ],
+    "anticipation": [
+        "menunggu", "berharap", "harap", "semoga", "rencana", "penasaran", "antusias",
+        "nanti", "besok", "persiapan", "target", "waiting", "hope", "expect", "plan", "soon",
+    ],
+    "disgust": [
+        "jijik", "muak", "mual", "menjijikkan", "jorok", "najis", "eneg", "risih",
+        "disgusting", "disgusted", "gross", "nasty", "sickening", "revolting",
+    ],
+    "fear": [
+        "takut", "cemas", "khawatir", "gelisah", "panik", "ngeri", "seram", "waswas",
+        "resah", "afraid", "scared", "anxious", "worried", "nervous", "panic", "terrified",
+    ],
+    "joy": [
+        "senang", "bahagia", "gembira", "seru", "asyik", "bangga", "lega", "syukur",
+        "bersyukur", "happy", "glad", "fun", "excited", "joy", "delighted", "cheerful",
+    ],
+    "sadness": [
+        "sedih", "kecewa", "menangis", "nangis", "galau", "hancur", "kesepian", "hampa",
+        "patah", "terpuruk", "sad", "lonely", "cry", "crying", "depressed", "heartbroken",
+    ],
+    "surprise": [
+        "kaget", "terkejut", "heran", "mendadak", "tiba", "terduga", "takjub", "syok",
+        "surprised", "shocked", "unexpected", "suddenly", "astonished", "wow",
+    ],
+    "trust": [
+        "percaya", "yakin", "aman", "tenang", "setia", "jujur", "mengandalkan", "dukung",
+        "didukung", "trust", "believe", "safe", "reliable", "loyal", "supported",
+    ],
+}
+
+# Each lexicon word counts as this many observations of its emotion.
+LEXICON_WEIGHT = 5
+
+# A lexicon word this many tokens or fewer after a negator ("tidak senang", "not happy") may mean
+# its opposite; the classifier cannot tell, so such notes are escalated instead of answered.
+NEGATORS = frozenset({
+    "tidak", "tak", "bukan", "belum", "jangan", "gak", "ga", "nggak", "enggak", "engga", "gk", "tdk",
+    "kurang", "not", "no", "never", "dont", "didnt", "isnt", "wasnt", "cant",
+})
+NEGATION_WINDOW = 3
+
+# note_emotions sources trusted as training labels; the classifier's own answers ("local") are
+# left out so it never reinforces itself
+TRAINING_SOURCES = ("llm", "human")
+
+_TOKEN_PATTERN = re.compile(r"[a-z]+")
+_SUFFIXES = ("nya", "lah", "kah")
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN_PATTERN.findall((text or "").lower()):
+        for suffix in _SUFFIXES:
+            if len(token) > len(suffix) + 3 and token.endswith(suffix):
+                token = token[:-len(suffix)]
+                break
+        tokens.append(token)
+    return tokens
+
+class EmotionClassifier:
+    """Multinomial naive Bayes over the seed lexicon plus any labelled notes it has been fitted on.
+
+    Cheap enough to run on every request on CPU; `predict` returns the label together
+    with its posterior probability so callers can decide whether to trust it.
+    """
+
+    def __init__(self, lexicon: Dict[str, List[str]], alpha: float = 1.0):
+        self.labels = list(lexicon)
+        self.alpha = alpha
+        self.token_counts: Dict[str, Counter] = defaultdict(Counter)
+        self.label_totals: Counter = Counter()
+        self.doc_counts: Counter = Counter()
+        self.vocabulary = set()
+        self.trained_samples = 0
+
+        for label, words in lexicon.items():
+            for word in words:
+                self._add(label, word, LEXICON_WEIGHT)
+
+        self.lexicon_words = {word for words in lexicon.values() for word in words}
+        self.local_answers = 0
+        self.escalations = 0
+        self.negations = 0
+
+    def fit(self, samples: Iterable[Tuple[str, str]]) -> int:
+        """Add (text, label) observations; unknown labels are skipped. Returns how many were used."""
+        used = 0
+        for text, label in samples:
+            label = (label or "").strip().lower()
+            if label not in self.labels:
+                continue
+
+            for token, count in Counter(tokenize(text)).items():
+                self._add(label, token, count)
+            self.doc_counts[label] += 1
+            used += 1
+
+        self.trained_samples += used
+        return used
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        tokens = Counter(token for token in tokenize(text) if token in self.vocabulary)
+        if not tokens:
+            return None, 0.0
+
+        vocabulary_size = len(self.vocabulary)
+        total_docs = sum(self.doc_counts.values())
+        scores = {}
+
+        for label in self.labels:
+            prior = (self.doc_counts[label] + 1) / (total_docs + len(self.labels))
+            denominator = self.label_totals[label] + self.alpha * vocabulary_size
+            score = math.log(prior)
+            for token, count in tokens.items():
+                score += count * math.log((self.token_counts[label][token] + self.alpha) / denominator)
+            scores[label] = score
+
+        best = max(scores, key=scores.get)
+        normalizer = sum(math.exp(score - scores[best]) for score in scores.values())
+        return best, 1.0 / normalizer
+
+    def negated(self, text: str) -> bool:
+        """True when a lexicon word follows a negator within NEGATION_WINDOW tokens."""
+        last_negator = None
+        for position, token in enumerate(tokenize(text)):
+            if token in NEGATORS:
+                last_negator = position
+            elif token in self.lexicon_words and last_negator is not None and position - last_negator <= NEGATION_WINDOW:
+                return True
+        return False
+
+    def classify(self, text: str, threshold: float) -> Optional[dict]:
+        """Return a result when confidence clears the threshold, otherwise None (escalate).
+
+        Negated emotion words always escalate. The classifier only knows emotions, so "mbti"
+        is None; callers fill it from the user's profile.
+        """
+        if self.negated(text):
+            self.negations += 1
+            self.escalations += 1
+            return None
+
+        label, confidence = self.predict(text)
+
+        if label is None or confidence < threshold:
+            self.escalations += 1
+            return None
+
+        self.local_answers += 1
+        return {"mbti": None, "emotion": label, "confidence": round(confidence, 4)}
+
+    async def train_from_db(self, limit: int) -> int:
+        """Fit on notes whose emotion in note_emotions came from the LLM or a person."""
+        from app.Models.notes import Notes
+        from app.Models.note_emotions import NoteEmotion
+        from app.Models.emotions import Emotion
+
+        query = (
+            select(Notes.title, Notes.content, Emotion.tipe_emosi)
+            .join(NoteEmotion, NoteEmotion.id_notes == Notes.id_notes)
+            .join(Emotion, Emotion.id_emotion == NoteEmotion.id_emotion)
+            .where(NoteEmotion.source.in_(TRAINING_SOURCES))
+            .order_by(NoteEmotion.id_noteEmotions.desc())
+            .limit(limit)
+        )
+
+        async with get_session() as session:
+            result = await session.exec(query)
+            rows = result.all()
+
+        used = self.fit((f"{title} {content}", tipe_emosi) for title, content, tipe_emosi in rows)
+        logger.info("Emotion classifier trained on %s labelled notes", used)
+        return used
+
+    def stats(self) -> dict:
+        answered = self.local_answers + self.escalations
+        return {
+            "threshold": Config.LOCAL_CLASSIFIER_THRESHOLD,
+            "vocabulary_size": len(self.vocabulary),
+            "trained_samples": self.trained_samples,
+            "local_answers": self.local_answers,
+            "escalations": self.escalations,
+            "negations": self.negations,
+            "local_ratio": self.local_answers / answered if answered else 0.0,
+        }
+
+    def _add(self, label: str, token: str, count: int) -> None:
+        self.token_counts[label][token] += count
+        self.label_totals[label] += count
+        self.vocabulary.add(token)
+
+emotion_classifier = EmotionClassifier(LEXICON)
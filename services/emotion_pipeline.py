@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import random
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+
+from app.Database.config import Config
+from app.Database.connection import get_session
+from app.Models.note_emotions import NoteEmotion
+from services.catalog import emotion_catalog
+from services.inference_service import inference_service, PLUTCHIK_EMOTIONS
+from services.profile_service import profile_service
+from services.note_embeddings import related_snippets
+
+logger = logging.getLogger(__name__)
+
+class EmotionPipeline:
+    """Background workers that tag newly written notes with their dominant emotion.
+
+    Jobs sit in a bounded queue and are processed by a fixed number of workers, with
+    exponential backoff between attempts. Job status is kept in memory per note.
+    """
+
+    def __init__(self, workers: int, queue_size: int, max_attempts: int, backoff_seconds: float, status_limit: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.status_limit = status_limit
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[int, dict]" = OrderedDict()
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def enqueue(self, note_id: int, id_user: UUID, text: str) -> dict:
+        """Schedule analysis of a note without waiting for it; returns the job status."""
+        self.start()
+
+        job = self._set_status(note_id, "queued", attempts=0)
+        try:
+            self._queue.put_nowait((note_id, id_user, text))
+        except asyncio.QueueFull:
+            job = self._set_status(note_id, "rejected", error="Analysis queue is full")
+            logger.warning("Emotion analysis queue full, note %s not analysed", note_id)
+
+        return job
+
+    def status(self, note_id: int) -> Optional[dict]:
+        return self._jobs.get(note_id)
+
+    def stats(self) -> dict:
+        counts = {}
+        for job in self._jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.queue_size,
+            "jobs": counts,
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            note_id, id_user, text = await self._queue.get()
+            try:
+                await self._process(note_id, id_user, text)
+            except Exception as e:
+                logger.exception("Emotion analysis for note %s crashed: %s", note_id, e)
+                self._set_status(note_id, "failed", error=str(e))
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, note_id: int, id_user: UUID, text: str) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            self._set_status(note_id, "running", attempts=attempt)
+
+            try:
+                async with get_session() as session:
+                    profile = await profile_service.get_profile(id_user, session)
+                    related = await related_snippets(id_user, text, Config.PROMPT_RELATED_NOTES, session, exclude_id=note_id)
+                history_notes = profile_service.build_context(
+                    profile, Config.PROMPT_HISTORY_TOKEN_BUDGET, related, exclude_id=note_id
+                )
+
+                result, tier = await inference_service.analyze(text, history_notes)
+
+                emotion = str(result.get("emotion") or "").strip().lower()
+                if emotion not in PLUTCHIK_EMOTIONS:
+                    raise ValueError(f"Unknown emotion '{emotion}'")
+
+                await self._store(note_id, id_user, emotion, result.get("mbti"), tier)
+                self._set_status(note_id, "done", attempts=attempt, emotion=emotion, tier=tier, error=None)
+                return
+
+            except IntegrityError as e:
+                # The note was deleted before we got to it; retrying cannot help.
+                self._set_status(note_id, "failed", attempts=attempt, error=str(e.orig))
+                return
+
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self._set_status(note_id, "failed", attempts=attempt, error=str(e))
+                    return
+
+                delay = self.backoff_seconds * (2 ** (attempt - 1))
+                self._set_status(note_id, "retrying", attempts=attempt, error=str(e))
+                await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+    async def _store(self, note_id: int, id_user: UUID, emotion_name: str, mbti: Optional[str], tier: str) -> None:
+        # Emotions are reference data seeded by a migration; workers never create them
+        emotion = emotion_catalog.emotion(emotion_name)
+        if not emotion:
+            raise ValueError(f"Emotion '{emotion_name}' is not in the catalog")
+
+        async with get_session() as session:
+            # Cached answers came from the LLM too; only "local" labels are kept out of training
+            source = "local" if tier == "local" else "llm"
+            session.add(NoteEmotion(id_notes=note_id, id_emotion=emotion.id_emotion, source=source))
+            await session.flush()
+
+            await profile_service.record_analysis(id_user, emotion_name, mbti, session)
+            await session.commit()
+
+    def _set_status(self, note_id: int, status: str, **fields) -> dict:
+        job = self._jobs.pop(note_id, {"id_notes": note_id})
+        job.update(fields, status=status, updated_at=datetime.now().isoformat())
+        self._jobs[note_id] = job
+
+        while len(self._jobs) > self.status_limit:
+            self._jobs.popitem(last=False)
+
+        return job
+
+emotion_pipeline = EmotionPipeline(
+    workers=Config.EMOTION_PIPELINE_WORKERS,
+    queue_size=Config.EMOTION_PIPELINE_QUEUE_SIZE,
+    max_attempts=Config.EMOTION_PIPELINE_MAX_ATTEMPTS,
+    backoff_seconds=Config.EMOTION_PIPELINE_BACKOFF_SECONDS,
+    status_limit=Config.EMOTION_PIPELINE_STATUS_LIMIT,
+)
@@ -0,0 +1,67 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+from typing import AsyncIterator, List, NamedTuple
+
+from services.inference_service import MBTI_TYPES, PLUTCHIK_EMOTIONS
+
+SINGLE_INPUT = re.compile(r'input dari pengguna:\s*"(.*?)"\s*Berikut adalah catatan riwayat', re.S)
+BATCH_INPUT = re.compile(r'\[(\d+)\]\s*Input pengguna: "(.*?)"\s*Catatan riwayat pengguna:', re.S)
+
+STREAM_CHUNK_CHARS = 8
+
+class FakeMessage(NamedTuple):
+    content: str
+
+class FakeChatModel:
+    """Offline stand-in for ChatOpenAI, selected with LLM_BACKEND=fake.
+
+    Answers the prompts InferenceService builds with well-formed JSON, choosing the MBTI
+    type and emotion from a hash of each input text, so the same note always gets the
+    same answer. Every call sleeps `latency_ms` +/- `jitter_ms` to stand in for the
+    network round trip; jitter comes from a seeded RNG so runs are repeatable.
+    """
+
+    def __init__(self, latency_ms: float, jitter_ms: float, seed: int = 0):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self._random = random.Random(seed)
+        self.calls = 0
+
+    def _delay(self) -> float:
+        return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def _answer_for(self, text: str) -> dict:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return {
+            "mbti": MBTI_TYPES[digest[0] % len(MBTI_TYPES)],
+            "emotion": PLUTCHIK_EMOTIONS[digest[1] % len(PLUTCHIK_EMOTIONS)],
+        }
+
+    def respond(self, prompt: str) -> str:
+        batch = BATCH_INPUT.findall(prompt)
+        if batch:
+            return json.dumps([{"index": int(index), **self._answer_for(text)} for index, text in batch])
+
+        match = SINGLE_INPUT.search(prompt)
+        return json.dumps(self._answer_for(match.group(1) if match else prompt))
+
+    async def ainvoke(self, prompt: str) -> FakeMessage:
+        self.calls += 1
+        await asyncio.sleep(self._delay())
+        return FakeMessage(self.respond(prompt))
+
+    async def astream(self, prompt: str) -> AsyncIterator[FakeMessage]:
+        self.calls += 1
+        content = self.respond(prompt)
+        chunks: List[str] = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+
+        # Half the latency before the first token, the rest spread over the remaining chunks
+        delay = self._delay()
+        await asyncio.sleep(delay / 2)
+        for position, chunk in enumerate(chunks):
+            if position:
+                await asyncio.sleep(delay / 2 / max(1, len(chunks) - 1))
+            yield FakeMessage(chunk)
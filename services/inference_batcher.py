@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class InferenceBatcher:
+    """Collects concurrent inference calls for a short window and sends them as one LLM request.
+
+    Items the batched answer does not cover (or covers with garbage) fall back to a
+    single call, so callers always get the same result shape as the unbatched path.
+    """
+
+    def __init__(self, service, window_ms: float, max_size: int):
+        self.service = service
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._dispatches: set = set()
+
+        self.batches = 0
+        self.batched_items = 0
+        self.fallbacks = 0
+
+    def start(self) -> None:
+        if self._collector is not None and not self._collector.done():
+            return
+
+        self._queue = asyncio.Queue()
+        self._collector = asyncio.create_task(self._collect())
+
+    async def stop(self) -> None:
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            self._collector = None
+
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+    async def submit(self, text: str, history_notes: Optional[List[str]]) -> dict:
+        self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, history_notes, future))
+        return await future
+
+    def stats(self) -> dict:
+        return {
+            "window_ms": self.window * 1000,
+            "max_size": self.max_size,
+            "batches": self.batches,
+            "batched_items": self.batched_items,
+            "fallbacks": self.fallbacks,
+        }
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+
+            while len(batch) < self.max_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Dispatch in the background so the next window starts collecting right away.
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, Optional[List[str]], asyncio.Future]]) -> None:
+        batch = [item for item in batch if not item[2].done()]
+        if not batch:
+            return
+
+        if len(batch) == 1:
+            await self._single(batch[0])
+            return
+
+        results: List[Optional[dict]] = [None] * len(batch)
+        try:
+            content = await self.service.invoke(
+                self.service.build_batch_prompt([(text, history) for text, history, _ in batch])
+            )
+            results = self.service.parse_batch_response(content, len(batch))
+            self.batches += 1
+        except Exception as e:
+            logger.warning("Batched inference failed, falling back to single calls: %s", e)
+
+        fallbacks = []
+        for item, result in zip(batch, results):
+            future = item[2]
+            if future.done():
+                continue
+            if result is None:
+                fallbacks.append(self._single(item))
+            else:
+                self.batched_items += 1
+                future.set_result(result)
+
+        if fallbacks:
+            self.fallbacks += len(fallbacks)
+            await asyncio.gather(*fallbacks)
+
+    async def _single(self, item: Tuple[str, Optional[List[str]], asyncio.Future]) -> None:
+        text, history_notes, future = item
+        try:
+            result = await self.service.complete(text, history_notes)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+
+        if not future.done():
+            future.set_result(result)
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import delete, select
+
+from app.Database.config import Config
+from app.Database.connection import get_session
+from app.Models.inference_cache import InferenceCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the prompt template changes so stale answers are not reused.
+PROMPT_VERSION = 2
+
+class InferenceCache:
+    """Two-tier cache for inference results: an in-process LRU with TTL and an optional Postgres table."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, persistent: bool):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.purged = 0
+        self._last_purge = time.monotonic()
+
+    def make_key(self, text: Optional[str], history_notes: Optional[List[str]]) -> str:
+        """Hash of the normalized prompt inputs and the model parameters."""
+        payload = {
+            "v": PROMPT_VERSION,
+            "text": self._normalize(text),
+            "history": [self._normalize(note) for note in history_notes or []],
+            "model": Config.LLM_MODEL,
+            "temperature": Config.LLM_TEMPERATURE,
+            "top_p": Config.LLM_TOP_P,
+            "max_tokens": Config.LLM_MAX_TOKENS,
+        }
+        encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._entries[key]
+
+        if self.persistent:
+            result = await self._get_persistent(key)
+            if result is not None:
+                self.persistent_hits += 1
+                self._set_memory(key, result)
+                return result
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, result: dict) -> None:
+        self._set_memory(key, result)
+
+        if self.persistent:
+            await self._set_persistent(key, result)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "persistent": self.persistent,
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "purged": self.purged,
+            "hit_ratio": (self.hits + self.persistent_hits) / lookups if lookups else 0.0,
+        }
+
+    def _normalize(self, value: Optional[str]) -> str:
+        return " ".join((value or "").split())
+
+    def _set_memory(self, key: str, result: dict) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _get_persistent(self, key: str) -> Optional[dict]:
+        try:
+            async with get_session() as session:
+                result = await session.exec(
+                    select(InferenceCacheEntry.result).where(
+                        InferenceCacheEntry.cache_key == key,
+                        InferenceCacheEntry.created_at >= self._min_created_at()
+                    )
+                )
+                return result.first()
+        except Exception as e:
+            logger.warning("Inference cache lookup failed: %s", e)
+            return None
+
+    async def _set_persistent(self, key: str, result: dict) -> None:
+        stmt = pg_insert(InferenceCacheEntry).values(
+            cache_key=key,
+            model=Config.LLM_MODEL,
+            result=result,
+            created_at=datetime.now()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[InferenceCacheEntry.cache_key],
+            set_={"result": stmt.excluded.result, "created_at": stmt.excluded.created_at}
+        )
+
+        # Expired rows are never read again; the write that falls due deletes them
+        purge = time.monotonic() - self._last_purge >= Config.INFERENCE_CACHE_PURGE_INTERVAL_SECONDS
+        if purge:
+            self._last_purge = time.monotonic()
+
+        try:
+            async with get_session() as session:
+                await session.exec(stmt)
+                if purge:
+                    deleted = await session.exec(
+                        delete(InferenceCacheEntry).where(InferenceCacheEntry.created_at < self._min_created_at())
+                    )
+                    self.purged += deleted.rowcount
+                await session.commit()
+        except Exception as e:
+            logger.warning("Inference cache write failed: %s", e)
+
+    def _min_created_at(self) -> datetime:
+        return datetime.now() - timedelta(seconds=Config.INFERENCE_CACHE_DB_TTL_SECONDS)
+
+inference_cache = InferenceCache(
+    max_entries=Config.INFERENCE_CACHE_MAX_ENTRIES,
+    ttl_seconds=Config.INFERENCE_CACHE_TTL_SECONDS,
+    persistent=Config.INFERENCE_CACHE_PERSISTENT,
+)
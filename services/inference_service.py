@@ -0,0 +1,262 @@
+import asyncio
+import json
+import re
+from typing import AsyncIterator, List, Optional, Tuple
+
+from app.Database.config import Config
+from services.emotion_classifier import emotion_classifier
+from services.inference_batcher import InferenceBatcher
+from services.inference_cache import inference_cache
+from utils.stream_parser import JSONFieldScanner
+from utils.tokens import fit_to_budget, truncate_to_tokens
+
+MBTI_TYPES = [
+    "INTJ", "INTP", "ENTJ", "ENTP",
+    "INFJ", "INFP", "ENFJ", "ENFP",
+    "ISTJ", "ISFJ", "ESTJ", "ESFJ",
+    "ISTP", "ISFP", "ESTP", "ESFP"
+]
+
+PLUTCHIK_EMOTIONS = [
+    "anger", "anticipation", "disgust", "fear",
+    "joy", "sadness", "surprise", "trust"
+]
+
+class InferenceParseError(Exception):
+    """The model answered, but not with the JSON we asked for."""
+
+    def __init__(self, error: str, raw_response: str):
+        super().__init__(error)
+        self.raw_response = raw_response
+
+class InferenceService:
+    """Owns the long-lived LLM client and bounds the number of in-flight calls."""
+
+    def __init__(self):
+        self.llm = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.batcher = InferenceBatcher(
+            self,
+            window_ms=Config.INFERENCE_BATCH_WINDOW_MS,
+            max_size=Config.INFERENCE_BATCH_MAX_SIZE,
+        )
+
+    def startup(self) -> None:
+        """Create the shared client once, on the first call that needs it, so booting never imports langchain."""
+        if self.llm is not None:
+            return
+
+        if Config.LLM_BACKEND == "fake":
+            from services.fake_llm import FakeChatModel
+
+            self.llm = FakeChatModel(
+                latency_ms=Config.FAKE_LLM_LATENCY_MS,
+                jitter_ms=Config.FAKE_LLM_JITTER_MS,
+                seed=Config.FAKE_LLM_SEED,
+            )
+        else:
+            from langchain_openai import ChatOpenAI
+
+            self.llm = ChatOpenAI(
+                model=Config.LLM_MODEL,
+                temperature=Config.LLM_TEMPERATURE,
+                max_tokens=Config.LLM_MAX_TOKENS,
+                top_p=Config.LLM_TOP_P,
+                timeout=Config.LLM_TIMEOUT_SECONDS,
+            )
+        self._semaphore = asyncio.Semaphore(Config.LLM_MAX_CONCURRENCY)
+
+    def build_prompt(self, text: str, history_notes: Optional[List[str]]) -> str:
+        return f"""
+                Kamu adalah seorang analis kepribadian dan emosi berdasarkan teks.
+
+                Berikut adalah input dari pengguna:
+                "{text}"
+
+                Berikut adalah catatan riwayat pengguna:
+                {self.format_history(history_notes)}
+
+                Tugasmu adalah melakukan dua hal berikut:
+
+                1. Tentukan tipe kepribadian MBTI pengguna yang paling sesuai dari daftar berikut, berdasarkan pola berpikir, ekspresi, dan catatan historis:
+                {", ".join(MBTI_TYPES)}
+
+                2. Berdasarkan tipe kepribadian MBTI tersebut, analisis bagaimana tipe tersebut biasanya mengekspresikan emosi. Gunakan pemahaman tersebut untuk menafsirkan emosi dominan yang sedang dialami pengguna saat ini berdasarkan ekspresi teks mereka.
+
+                Pilih satu emosi utama dari daftar berikut:
+                {", ".join(PLUTCHIK_EMOTIONS)}
+
+                ⚠️ Catatan penting:
+                Jangan menilai emosi hanya dari kata-kata literal dalam input, tetapi sesuaikan juga dengan kecenderungan ekspresif dari tipe kepribadian yang telah kamu identifikasi. Misalnya, tipe INTJ mungkin menunjukkan kesedihan dengan kalimat yang tampak netral, sementara ENFP mungkin menunjukkannya dengan cara yang lebih ekspresif.
+
+                Berikan hasil akhir dalam format JSON **tanpa tambahan penjelasan atau blok markdown**, seperti berikut:
+                {{
+                "mbti": "<tipe MBTI>",
+                "emotion": "<emosi dominan>"
+                }}
+            """
+
+    def build_batch_prompt(self, items: List[Tuple[str, Optional[List[str]]]]) -> str:
+        entries = "\n".join(
+            f"""
+                [{index}]
+                Input pengguna: "{text}"
+                Catatan riwayat pengguna:
+                {self.format_history(history_notes)}
+            """
+            for index, (text, history_notes) in enumerate(items)
+        )
+
+        return f"""
+                Kamu adalah seorang analis kepribadian dan emosi berdasarkan teks.
+
+                Berikut adalah {len(items)} input dari pengguna yang berbeda, masing-masing diberi nomor indeks:
+                {entries}
+
+                Untuk SETIAP input, lakukan dua hal berikut secara terpisah:
+
+                1. Tentukan tipe kepribadian MBTI pengguna yang paling sesuai dari daftar berikut, berdasarkan pola berpikir, ekspresi, dan catatan historis:
+                {", ".join(MBTI_TYPES)}
+
+                2. Berdasarkan tipe kepribadian MBTI tersebut, analisis bagaimana tipe tersebut biasanya mengekspresikan emosi. Gunakan pemahaman tersebut untuk menafsirkan emosi dominan yang sedang dialami pengguna saat ini berdasarkan ekspresi teks mereka.
+
+                Pilih satu emosi utama dari daftar berikut:
+                {", ".join(PLUTCHIK_EMOTIONS)}
+
+                ⚠️ Catatan penting:
+                Jangan menilai emosi hanya dari kata-kata literal dalam input, tetapi sesuaikan juga dengan kecenderungan ekspresif dari tipe kepribadian yang telah kamu identifikasi. Jangan mencampur informasi antar input.
+
+                Berikan hasil akhir dalam format JSON array **tanpa tambahan penjelasan atau blok markdown**, satu objek per input sesuai urutan indeks, seperti berikut:
+                [
+                {{"index": 0, "mbti": "<tipe MBTI>", "emotion": "<emosi dominan>"}}
+                ]
+            """
+
+    def format_history(self, history_notes: Optional[List[str]]) -> str:
+        if not history_notes:
+            return "(belum ada catatan riwayat)"
+        return "\n                ".join(f"- {note}" for note in history_notes)
+
+    def prepare_inputs(self, text: str, history_notes: Optional[List[str]]) -> Tuple[str, List[str]]:
+        """Clamp the note text and history to their token budgets so prompt size stays flat."""
+        return (
+            truncate_to_tokens(text, Config.PROMPT_TEXT_TOKEN_BUDGET),
+            fit_to_budget(history_notes or [], Config.PROMPT_HISTORY_TOKEN_BUDGET),
+        )
+
+    def parse_response(self, content: str) -> dict:
+        """Strip markdown fences and decode the JSON answer; raises JSONDecodeError."""
+        cleaned = re.sub(r"```json|```", "", content).strip()
+        return json.loads(cleaned)
+
+    def parse_batch_response(self, content: str, size: int) -> List[Optional[dict]]:
+        """Map a batched JSON array back onto its items; unusable entries come back as None."""
+        parsed = self.parse_response(content)
+        results: List[Optional[dict]] = [None] * size
+
+        if not isinstance(parsed, list):
+            return results
+
+        for position, item in enumerate(parsed):
+            if not isinstance(item, dict) or "mbti" not in item or "emotion" not in item:
+                continue
+
+            index = item.get("index", position)
+            if isinstance(index, int) and 0 <= index < size and results[index] is None:
+                results[index] = {"mbti": item["mbti"], "emotion": item["emotion"]}
+
+        return results
+
+    async def invoke(self, prompt: str) -> str:
+        """Run one completion on the event loop, waiting for a free slot first."""
+        if self.llm is None:
+            self.startup()
+
+        async with self._semaphore:
+            response = await self.llm.ainvoke(prompt)
+
+        return response.content
+
+    async def analyze(self, text: str, history_notes: Optional[List[str]]) -> Tuple[dict, str]:
+        """Return the parsed {mbti, emotion} result and the tier that produced it.
+
+        Tiers are tried cheapest first: the local classifier ("local"), the result
+        cache ("cache"), and finally the LLM ("llm").
+        """
+        local = self.classify_locally(text)
+        if local is not None:
+            return local, "local"
+
+        text, history_notes = self.prepare_inputs(text, history_notes)
+
+        key = inference_cache.make_key(text, history_notes)
+
+        cached = await inference_cache.get(key)
+        if cached is not None:
+            return cached, "cache"
+
+        if Config.INFERENCE_BATCH_ENABLED:
+            result = await self.batcher.submit(text, history_notes)
+        else:
+            result = await self.complete(text, history_notes)
+
+        await inference_cache.set(key, result)
+        return result, "llm"
+
+    def classify_locally(self, text: str) -> Optional[dict]:
+        if not Config.LOCAL_CLASSIFIER_ENABLED:
+            return None
+        return emotion_classifier.classify(text, Config.LOCAL_CLASSIFIER_THRESHOLD)
+
+    async def complete(self, text: str, history_notes: Optional[List[str]]) -> dict:
+        """One unbatched, uncached LLM round trip."""
+        content = await self.invoke(self.build_prompt(text, history_notes))
+
+        try:
+            return self.parse_response(content)
+        except json.JSONDecodeError as e:
+            raise InferenceParseError(str(e), content)
+
+    async def stream(self, text: str, history_notes: Optional[List[str]]) -> AsyncIterator[Tuple[str, dict]]:
+        """Yield (event, data) pairs: raw tokens, early mbti/emotion fields, then the final result."""
+        local = self.classify_locally(text)
+        if local is not None:
+            yield "emotion", {"emotion": local["emotion"]}
+            yield "result", {"result": local, "tier": "local"}
+            return
+
+        text, history_notes = self.prepare_inputs(text, history_notes)
+
+        key = inference_cache.make_key(text, history_notes)
+
+        cached = await inference_cache.get(key)
+        if cached is not None:
+            yield "emotion", {"emotion": cached.get("emotion")}
+            yield "result", {"result": cached, "tier": "cache"}
+            return
+
+        if self.llm is None:
+            self.startup()
+
+        scanner = JSONFieldScanner(("mbti", "emotion"))
+        async with self._semaphore:
+            async for chunk in self.llm.astream(self.build_prompt(text, history_notes)):
+                if not chunk.content:
+                    continue
+
+                yield "token", {"text": chunk.content}
+                for field, value in scanner.feed(chunk.content):
+                    yield field, {field: value}
+
+        try:
+            result = self.parse_response(scanner.buffer)
+        except json.JSONDecodeError as e:
+            raise InferenceParseError(str(e), scanner.buffer)
+
+        await inference_cache.set(key, result)
+        yield "result", {"result": result, "tier": "llm"}
+
+    async def shutdown(self) -> None:
+        await self.batcher.stop()
+
+inference_service = InferenceService()
@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import select, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.Database.connection import close_db, get_session, init_db
+from app.Database.migrations import MOOD_ROLLUP_SELECT, ROLLUP_PERIODS
+from app.Models.mood_rollup import MoodRollup
+from services.catalog import emotion_catalog
+
+logger = logging.getLogger(__name__)
+
+class MoodRollupService:
+    """Reads the trigger-maintained mood_rollups table and rebuilds it for backfills."""
+
+    async def timeline(
+        self,
+        id_user: UUID,
+        period: str,
+        start: date,
+        end: date,
+        session: AsyncSession
+    ) -> List[dict]:
+        """Per-period emotion counts and the dominant emotion, oldest period first.
+
+        Touches only the user's rollup rows in range, so cost follows the range, not the diary size.
+        """
+        if period not in ROLLUP_PERIODS:
+            raise ValueError(f"period must be one of {', '.join(ROLLUP_PERIODS)}")
+
+        result = await session.execute(
+            select(MoodRollup.period_start, MoodRollup.id_emotion, MoodRollup.note_count)
+            .where(
+                MoodRollup.id_user == id_user,
+                MoodRollup.period == period,
+                MoodRollup.period_start.between(start, end)
+            )
+            .order_by(MoodRollup.period_start)
+        )
+
+        timeline = {}
+        emotions = emotion_catalog.snapshot.emotions_by_id
+        for period_start, id_emotion, note_count in result.tuples():
+            entry = emotions.get(id_emotion)
+            name = entry.tipe_emosi if entry else str(id_emotion)
+            bucket = timeline.setdefault(period_start, {"period_start": period_start, "counts": {}, "total": 0})
+            bucket["counts"][name] = bucket["counts"].get(name, 0) + note_count
+            bucket["total"] += note_count
+
+        for bucket in timeline.values():
+            # Ties go to the alphabetically first emotion so the answer is stable
+            bucket["dominant"] = min(bucket["counts"], key=lambda name: (-bucket["counts"][name], name))
+
+        return list(timeline.values())
+
+    async def rebuild(self, id_user: Optional[UUID] = None) -> int:
+        """Recompute rollups from notes and note_emotions, for everyone or one user. Returns rows written."""
+        user_filter = "WHERE id_user = :id_user" if id_user else ""
+        params = {"id_user": id_user} if id_user else {}
+
+        async with get_session() as session:
+            # Hold off trigger updates until the recomputed rows are committed
+            await session.execute(text("LOCK TABLE mood_rollups IN EXCLUSIVE MODE"))
+            await session.execute(text(f"DELETE FROM mood_rollups {user_filter}"), params)
+            result = await session.execute(
+                text(
+                    "INSERT INTO mood_rollups (id_user, period, period_start, id_emotion, note_count) "
+                    f"SELECT * FROM ({MOOD_ROLLUP_SELECT}) AS fresh {user_filter}"
+                ),
+                params
+            )
+            await session.commit()
+
+        logger.info("Rebuilt %s mood rollup rows%s", result.rowcount, f" for user {id_user}" if id_user else "")
+        return result.rowcount
+
+def period_floor(period: str, day: date) -> date:
+    """Start of the rollup bucket containing `day`; weeks start on Monday, as date_trunc('week') does."""
+    return day - timedelta(days=day.weekday()) if period == "week" else day
+
+def default_range(period: str, start: Optional[date], end: Optional[date]) -> tuple:
+    """Last 30 days or 12 weeks up to `end` (default today) when no start is given.
+
+    `start` is moved back to its bucket's first day, so the bucket it falls in is not dropped.
+    """
+    end = end or date.today()
+    start = start or end - (timedelta(days=29) if period == "day" else timedelta(weeks=11))
+    return period_floor(period, start), end
+
+mood_rollup_service = MoodRollupService()
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the mood_rollups table")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--user", type=UUID, default=None, help="only rebuild this user's rollups")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    await init_db()
+    try:
+        rows = await mood_rollup_service.rebuild(args.user)
+        print(f"{rows} rollup rows written")
+    finally:
+        await close_db()
+
+if __name__ == "__main__":
+    asyncio.run(main())
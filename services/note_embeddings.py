@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import math
+import os
+import weakref
+import zlib
+from collections import Counter, OrderedDict
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.Database.config import Config
+from app.Database.connection import get_session
+from app.Models.notes import Notes
+from services.emotion_classifier import tokenize
+from utils.tokens import truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+class HashingEmbedder:
+    """CPU-only text embedder: signed feature hashing of unigrams and bigrams, L2-normalised.
+
+    Uses crc32 rather than hash() so vectors are stable across processes and restarts.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def embed(self, text: str) -> np.ndarray:
+        tokens = tokenize(text)
+        features = Counter(tokens)
+        features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in features.items():
+            digest = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % self.dim] += sign * (1.0 + math.log(count))
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.empty((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            vectors[i] = self.embed(text)
+        return vectors
+
+class NoteVectorStore:
+    """Per-user float32 matrices of note embeddings, persisted as memory-mapped .npy files.
+
+    A user's vectors are built from the database on first use and then kept up to date
+    by note writes; searches are a single matrix-vector product plus argpartition. Bulk
+    embedding runs in a worker thread so large imports don't stall the event loop.
+
+    Cached matrices are checked against the file's mtime on every use, so writes from other
+    workers are picked up. Writers are only serialised within a process: two workers updating
+    the same user at once can drop one update until the vectors are rebuilt.
+    """
+
+    def __init__(self, embedder: HashingEmbedder, directory: str, cache_users: int):
+        self.embedder = embedder
+        self.directory = directory
+        self.cache_users = cache_users
+        # (ids, vectors, file version) per user; the version is the vectors file's mtime
+        self._stores: "OrderedDict[UUID, Tuple[np.ndarray, np.ndarray, int]]" = OrderedDict()
+        # Entries disappear once no task holds or waits on the lock
+        self._locks: "weakref.WeakValueDictionary[UUID, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    async def upsert_many(self, id_user: UUID, items: Sequence[Tuple[int, str]]) -> None:
+        """Embed created or edited (note_id, text) pairs of one user with a single file write.
+
+        Best effort: on failure the user's vectors are rebuilt on next use.
+        """
+        try:
+            embedded = await asyncio.to_thread(self.embedder.embed_many, [text for _, text in items])
+
+            async with self._lock(id_user):
+                ids, vectors = await self._load(id_user)
+                vectors = np.array(vectors)
+                positions = {int(note_id): i for i, note_id in enumerate(ids)}
+
+                new_ids, new_vectors = [], []
+                for (note_id, _), vector in zip(items, embedded):
+                    if note_id in positions:
+                        vectors[positions[note_id]] = vector
+                    else:
+                        positions[note_id] = len(ids) + len(new_ids)
+                        new_ids.append(note_id)
+                        new_vectors.append(vector)
+
+                if new_ids:
+                    ids = np.concatenate([ids, np.asarray(new_ids, dtype=np.int64)])
+                    vectors = np.vstack([vectors, np.stack(new_vectors)])
+
+                await self._save(id_user, ids, vectors)
+        except Exception as e:
+            logger.warning("Embedding notes failed, vectors for user %s will be rebuilt: %s", id_user, e)
+            self.forget(id_user)
+
+    async def remove(self, id_user: UUID, note_ids: List[int]) -> None:
+        """Drop deleted notes. Best effort, like upsert_many."""
+        try:
+            async with self._lock(id_user):
+                ids, vectors = await self._load(id_user)
+
+                keep = ~np.isin(ids, np.asarray(note_ids, dtype=np.int64))
+                if keep.all():
+                    return
+
+                await self._save(id_user, ids[keep], np.array(vectors[keep]))
+        except Exception as e:
+            logger.warning("Removing vectors for user %s failed, they will be rebuilt: %s", id_user, e)
+            self.forget(id_user)
+
+    async def search(self, id_user: UUID, text: str, k: int, exclude_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Return up to k (note_id, cosine similarity) pairs, best first."""
+        async with self._lock(id_user):
+            ids, vectors = await self._load(id_user)
+
+        if not ids.size:
+            return []
+
+        scores = vectors @ self.embedder.embed(text)
+        if exclude_id is not None:
+            scores = np.where(ids == exclude_id, -np.inf, scores)
+
+        k = min(k, ids.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [(int(ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    def forget(self, id_user: UUID) -> None:
+        """Drop a user's vectors so they are rebuilt from the database on next use."""
+        self._stores.pop(id_user, None)
+        for path in self._paths(id_user):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    async def _load(self, id_user: UUID) -> Tuple[np.ndarray, np.ndarray]:
+        ids_path, vectors_path = self._paths(id_user)
+        version = self._version(vectors_path)
+
+        cached = self._stores.get(id_user)
+        if cached is not None and cached[2] == version:
+            self._stores.move_to_end(id_user)
+            return cached[0], cached[1]
+
+        if version and os.path.exists(ids_path):
+            ids = np.load(ids_path)
+            vectors = np.load(vectors_path, mmap_mode="r")
+            # A mismatch means another worker was between its two file writes; rebuild instead
+            if ids.shape[0] == vectors.shape[0]:
+                self._remember(id_user, ids, vectors, version)
+                return ids, vectors
+
+        ids, vectors = await self._build(id_user)
+        await self._save(id_user, ids, vectors)
+        return ids, vectors
+
+    async def _build(self, id_user: UUID) -> Tuple[np.ndarray, np.ndarray]:
+        async with get_session() as session:
+            result = await session.exec(
+                select(Notes.id_notes, Notes.title, Notes.content).where(Notes.id_user == id_user)
+            )
+            rows = result.all()
+
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        vectors = await asyncio.to_thread(self.embedder.embed_many, [f"{title}\n{content}" for _, title, content in rows])
+
+        return ids, vectors
+
+    async def _save(self, id_user: UUID, ids: np.ndarray, vectors: np.ndarray) -> None:
+        await asyncio.to_thread(self._write, id_user, ids, vectors)
+        self._remember(id_user, ids, vectors, self._version(self._paths(id_user)[1]))
+
+    def _write(self, id_user: UUID, ids: np.ndarray, vectors: np.ndarray) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        for path, array in zip(self._paths(id_user), (ids, vectors)):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(tmp_path, path)
+
+    def _remember(self, id_user: UUID, ids: np.ndarray, vectors: np.ndarray, version: int) -> None:
+        self._stores[id_user] = (ids, vectors, version)
+        self._stores.move_to_end(id_user)
+
+        while len(self._stores) > self.cache_users:
+            self._stores.popitem(last=False)
+
+    def _paths(self, id_user: UUID) -> Tuple[str, str]:
+        return (
+            os.path.join(self.directory, f"{id_user}.ids.npy"),
+            os.path.join(self.directory, f"{id_user}.vectors.npy"),
+        )
+
+    def _version(self, path: str) -> int:
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def _lock(self, id_user: UUID) -> asyncio.Lock:
+        lock = self._locks.get(id_user)
+        if lock is None:
+            lock = self._locks[id_user] = asyncio.Lock()
+        return lock
+
+async def related_snippets(
+    id_user: UUID,
+    text: str,
+    k: int,
+    session: AsyncSession,
+    exclude_id: Optional[int] = None
+) -> List[str]:
+    """Short excerpts of the user's notes most similar to `text`, for the inference prompt."""
+    if k <= 0 or not text:
+        return []
+
+    matches = await note_vector_store.search(id_user, text, k, exclude_id)
+    if not matches:
+        return []
+
+    result = await session.exec(
+        select(Notes.id_notes, Notes.title, Notes.content).where(Notes.id_notes.in_([note_id for note_id, _ in matches]))
+    )
+    notes = {row[0]: row for row in result.all()}
+
+    return [
+        truncate_to_tokens(f"{notes[note_id][1]}: {notes[note_id][2]}", Config.PROFILE_SNIPPET_TOKENS)
+        for note_id, _ in matches if note_id in notes
+    ]
+
+note_vector_store = NoteVectorStore(
+    HashingEmbedder(Config.EMBEDDING_DIM),
+    directory=Config.VECTOR_STORE_DIR,
+    cache_users=Config.VECTOR_STORE_CACHE_USERS,
+)
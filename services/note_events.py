@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Iterable, Sequence
+
+from app.Database.connection import get_session
+from services.emotion_pipeline import emotion_pipeline
+from services.note_embeddings import note_vector_store
+from services.profile_service import profile_service
+
+logger = logging.getLogger(__name__)
+
+def group_by_user(rows: Iterable) -> dict:
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[row.id_user].append(row)
+    return grouped
+
+class NoteEvents:
+    """Follow-up work for committed note writes, run off the request path.
+
+    Handlers commit their single write statement and hand the returned rows here;
+    profile summaries, embeddings and emotion analysis catch up in the background.
+    Rows only need id_notes and id_user (plus title and content for writes).
+    """
+
+    def __init__(self):
+        self._tasks: set = set()
+
+    def written(self, notes: Sequence, is_new: bool, analyze: bool = True) -> None:
+        """`analyze=False` skips emotion tagging, e.g. for bulk imports that would flood the pipeline."""
+        if notes:
+            self._spawn(self._on_written(list(notes), is_new, analyze))
+
+    def deleted(self, notes: Sequence) -> None:
+        if notes:
+            self._spawn(self._on_deleted(list(notes)))
+
+    async def drain(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _on_written(self, notes: list, is_new: bool, analyze: bool) -> None:
+        for id_user, user_notes in group_by_user(notes).items():
+            async with get_session() as session:
+                await profile_service.record_notes(id_user, user_notes, session, is_new)
+                await session.commit()
+
+            await note_vector_store.upsert_many(
+                id_user, [(note.id_notes, f"{note.title}\n{note.content}") for note in user_notes]
+            )
+
+        if is_new and analyze:
+            for note in notes:
+                emotion_pipeline.enqueue(note.id_notes, note.id_user, f"{note.title}\n{note.content}")
+
+    async def _on_deleted(self, notes: list) -> None:
+        for id_user, user_notes in group_by_user(notes).items():
+            note_ids = [note.id_notes for note in user_notes]
+
+            async with get_session() as session:
+                await profile_service.forget_notes(id_user, note_ids, session)
+                await session.commit()
+
+            await note_vector_store.remove(id_user, note_ids)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error("Note follow-up work failed: %s", task.exception())
+
+note_events = NoteEvents()
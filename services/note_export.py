@@ -0,0 +1,78 @@
+import csv
+import io
+from typing import AsyncIterator
+from uuid import UUID
+
+import msgspec
+from sqlalchemy import func, select
+
+from app.Database.connection import get_session
+from app.DTOs.notes_dto import NotesExportRecord, NotesRecord
+from app.Models.notes import Notes
+from app.Models.note_emotions import NoteEmotion
+from services.catalog import emotion_catalog
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+NOTE_FIELDS = ("id_notes", "id_user", "title", "content", "created_at", "updated_at")
+
+async def export_notes(id_user: UUID, fmt: str, with_emotions: bool, chunk_size: int) -> AsyncIterator[bytes]:
+    """Every note of a user, oldest first, encoded one chunk of rows at a time.
+
+    Rows come from a server-side cursor `chunk_size` at a time and each chunk is encoded and
+    yielded before the next is fetched, so memory does not grow with the number of notes.
+    Opens its own session: it outlives the request handler that returns it.
+    """
+    columns = [Notes.id_notes, Notes.id_user, Notes.title, Notes.content, Notes.created_at, Notes.updated_at]
+    if with_emotions:
+        columns.append(
+            select(func.array_agg(NoteEmotion.id_emotion))
+            .where(NoteEmotion.id_notes == Notes.id_notes)
+            .scalar_subquery()
+        )
+
+    query = (
+        select(*columns)
+        .where(Notes.id_user == id_user)
+        .order_by(Notes.created_at, Notes.id_notes)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    if fmt == "csv":
+        # Header goes out before the query runs so the client sees bytes immediately
+        yield encode_csv([NOTE_FIELDS + (("emotions",) if with_emotions else ())])
+
+    encoder = msgspec.json.Encoder()
+    emotions = emotion_catalog.snapshot.emotions_by_id
+
+    async with get_session() as session:
+        result = await session.stream(query)
+
+        async for partition in result.partitions():
+            if with_emotions:
+                records = [
+                    NotesExportRecord(*row[:-1], [emotions[i].tipe_emosi for i in (row[-1] or ()) if i in emotions])
+                    for row in partition
+                ]
+            else:
+                records = [NotesRecord(*row) for row in partition]
+
+            if fmt == "csv":
+                yield encode_csv(csv_row(record, with_emotions) for record in records)
+            else:
+                yield b"".join(encoder.encode(record) + b"\n" for record in records)
+
+def csv_row(record, with_emotions: bool) -> tuple:
+    row = (
+        record.id_notes, record.id_user, record.title, record.content,
+        record.created_at.isoformat(), record.updated_at.isoformat() if record.updated_at else ""
+    )
+    return row + (";".join(record.emotions),) if with_emotions else row
+
+def encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import time
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple, Union
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlmodel import text
+
+from app.Database.config import Config
+from app.Database.connection import close_db, get_session, init_db
+from app.DTOs.notes_dto import NotesCreateDTO
+from services.note_events import note_events
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+STAGING_TABLE = "notes_import"
+STAGING_COLUMNS = ("line", "id_user", "title", "content", "created_at", "updated_at")
+
+CREATE_STAGING = f"""
+    CREATE TEMP TABLE {STAGING_TABLE} (
+        line integer NOT NULL,
+        id_user uuid NOT NULL,
+        title varchar(200) NOT NULL,
+        content text NOT NULL,
+        created_at timestamp NOT NULL,
+        updated_at timestamp NOT NULL
+    ) ON COMMIT DROP
+"""
+
+UNKNOWN_OWNER = "NOT EXISTS (SELECT 1 FROM users u WHERE u.uid = s.id_user)"
+
+# A row is a duplicate when the same user already has a note with the same timestamp, title and
+# content, either in the table or earlier in the same file; the first occurrence wins
+INSERT_NEW_NOTES = f"""
+    INSERT INTO notes (id_user, title, content, created_at, updated_at)
+    SELECT DISTINCT ON (s.id_user, s.created_at, s.title, s.content)
+        s.id_user, s.title, s.content, s.created_at, s.updated_at
+    FROM {STAGING_TABLE} s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM notes n
+        WHERE n.id_user = s.id_user AND n.created_at = s.created_at
+          AND n.title = s.title AND n.content = s.content
+    )
+    ORDER BY s.id_user, s.created_at, s.title, s.content, s.line
+    RETURNING id_notes, id_user, title, content, created_at
+"""
+
+class ImportReport:
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.received = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self.started = time.perf_counter()
+
+    def fail(self, line: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": error})
+
+    def to_dict(self) -> dict:
+        seconds = time.perf_counter() - self.started
+        return {
+            "received": self.received,
+            "imported": self.imported,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(self.imported / seconds, 1) if seconds else 0.0,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    buffer = b""
+    number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            number += 1
+            yield number, line.decode("utf-8", errors="replace").rstrip("\r")
+
+    if buffer:
+        yield number + 1, buffer.decode("utf-8", errors="replace").rstrip("\r")
+
+async def iter_rows(chunks: AsyncIterable[bytes], fmt: str) -> AsyncIterator[Tuple[int, Union[dict, str]]]:
+    """(line number, fields) per record, or (line number, error message) for records that don't parse."""
+    if fmt == "ndjson":
+        async for number, line in iter_lines(chunks):
+            if not line.strip():
+                continue
+            try:
+                fields = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, f"Invalid JSON: {e.msg}"
+                continue
+            yield number, fields if isinstance(fields, dict) else "Expected a JSON object"
+        return
+
+    header = None
+    pending, start = [], 0
+    async for number, line in iter_lines(chunks):
+        if not pending:
+            if not line.strip():
+                continue
+            start = number
+        pending.append(line)
+
+        # Quoted fields may contain newlines; a record is complete once its quotes balance
+        record = "\n".join(pending)
+        if record.count('"') % 2:
+            continue
+        pending = []
+
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+        elif len(values) != len(header):
+            yield start, f"Expected {len(header)} columns, got {len(values)}"
+        else:
+            yield start, dict(zip(header, values))
+
+    if pending:
+        yield start, "Unterminated quoted field"
+
+def parse_timestamp(value) -> Optional[datetime]:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(str(value))
+    # notes timestamps are naive local time
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+def validate_row(line: int, fields: dict, default_user: Optional[UUID], now: datetime, owner: Optional[UUID] = None) -> tuple:
+    note = NotesCreateDTO(
+        title=fields.get("title"),
+        content=fields.get("content"),
+        id_user=fields.get("id_user") or default_user
+    )
+    if owner is not None and note.id_user != owner:
+        raise ValueError(f"Not allowed to import notes for user {note.id_user}")
+    created_at = parse_timestamp(fields.get("created_at")) or now
+    updated_at = parse_timestamp(fields.get("updated_at")) or created_at
+    return (line, note.id_user, note.title, note.content, created_at, updated_at)
+
+def describe(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, item['loc']))}: {item['msg']}" for item in error.errors())
+    return str(error)
+
+async def import_notes(
+    chunks: AsyncIterable[bytes],
+    fmt: str,
+    default_user: Optional[UUID] = None,
+    batch_size: int = Config.IMPORT_BATCH_SIZE,
+    analyze: bool = False,
+    owner: Optional[UUID] = None
+) -> dict:
+    """Load NDJSON/CSV notes in one transaction: validate in batches, COPY into a staging table,
+    then move new rows into notes with a single deduplicating INSERT ... SELECT.
+
+    Rows need title and content, plus id_user unless `default_user` is given; created_at and
+    updated_at (ISO 8601) are optional. Emotion analysis is skipped unless `analyze` is set.
+    With `owner` set, rows whose id_user is anyone else fail instead of being imported.
+    """
+    report = ImportReport(Config.IMPORT_MAX_ERRORS)
+    now = datetime.now()
+
+    async with get_session() as session:
+        # Runs through SQLAlchemy first so the transaction is open before COPY uses the raw connection
+        await session.execute(text(CREATE_STAGING))
+        raw_connection = await (await session.connection()).get_raw_connection()
+        copy_connection = raw_connection.driver_connection
+
+        batch = []
+        async for line, fields in iter_rows(chunks, fmt):
+            report.received += 1
+            if isinstance(fields, str):
+                report.fail(line, fields)
+                continue
+
+            try:
+                batch.append(validate_row(line, fields, default_user, now, owner))
+            except ValueError as e:
+                report.fail(line, describe(e))
+
+            if len(batch) >= batch_size:
+                await copy_connection.copy_records_to_table(STAGING_TABLE, records=batch, columns=STAGING_COLUMNS)
+                batch = []
+
+        if batch:
+            await copy_connection.copy_records_to_table(STAGING_TABLE, records=batch, columns=STAGING_COLUMNS)
+
+        result = await session.execute(text(f"SELECT line, id_user FROM {STAGING_TABLE} s WHERE {UNKNOWN_OWNER} ORDER BY line"))
+        for line, id_user in result.all():
+            report.fail(line, f"User {id_user} not found")
+        await session.execute(text(f"DELETE FROM {STAGING_TABLE} s WHERE {UNKNOWN_OWNER}"))
+
+        staged = (await session.execute(text(f"SELECT count(*) FROM {STAGING_TABLE}"))).scalar_one()
+        created = (await session.execute(text(INSERT_NEW_NOTES))).all()
+        await session.commit()
+
+    report.imported = len(created)
+    report.duplicates = staged - len(created)
+
+    note_events.written(sorted(created, key=lambda note: (note.created_at, note.id_notes)), is_new=True, analyze=analyze)
+
+    summary = report.to_dict()
+    logger.info(
+        "Imported %s notes (%s duplicates, %s failed) at %s rows/s",
+        summary["imported"], summary["duplicates"], summary["failed"], summary["rows_per_second"]
+    )
+    return summary
+
+async def read_file(path: str, chunk_size: int = 1 << 20) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import notes from an NDJSON or CSV file")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default=None, help="defaults to the file extension")
+    parser.add_argument("--user", type=UUID, default=None, help="owner for rows without id_user")
+    parser.add_argument("--batch-size", type=int, default=Config.IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+
+    logging.basicConfig(level=logging.INFO)
+    await init_db()
+    try:
+        # No analysis workers run in the CLI, so imported notes are not queued for emotion tagging
+        report = await import_notes(read_file(args.path), fmt, args.user, args.batch_size)
+        # Let profile and embedding updates for the imported notes finish before exiting
+        await note_events.drain()
+    finally:
+        await close_db()
+
+    print(json.dumps(report, indent=2, default=str))
+
+if __name__ == "__main__":
+    asyncio.run(main())
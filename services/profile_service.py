@@ -0,0 +1,146 @@
+from datetime import datetime
+from typing import List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.Database.config import Config
+from app.Models.emotions import Emotion
+from app.Models.note_emotions import NoteEmotion
+from app.Models.notes import Notes
+from app.Models.user_profile import UserProfile
+from utils.tokens import fit_to_budget, truncate_to_tokens
+
+class ProfileService:
+    """Keeps a compact, incrementally updated mood/personality profile per user.
+
+    Note writes update it after they commit (services/note_events.py), emotion analysis in
+    the same transaction that stores the label; inference reads it instead of the full
+    note history.
+    """
+
+    async def get_profile(self, id_user: UUID, session: AsyncSession) -> Optional[UserProfile]:
+        result = await session.exec(select(UserProfile).where(UserProfile.id_user == id_user))
+        return result.first()
+
+    async def record_notes(self, id_user: UUID, notes: Sequence[Notes], session: AsyncSession, is_new: bool = True) -> None:
+        """Push snippets of one user's written notes, oldest first, into the bounded recent-notes
+        summary under a single profile lock. Does not commit."""
+        profile = await self._get_for_update(id_user, session)
+
+        written = {note.id_notes for note in notes}
+        recent = [item for item in profile.recent_notes if item.get("id_notes") not in written]
+        # Only the newest notes can end up in the summary; skip snippets for the rest (bulk imports)
+        for note in notes[-Config.PROFILE_RECENT_NOTES:]:
+            recent.insert(0, {
+                "id_notes": note.id_notes,
+                "snippet": truncate_to_tokens(f"{note.title}: {note.content}", Config.PROFILE_SNIPPET_TOKENS),
+            })
+        profile.recent_notes = recent[:Config.PROFILE_RECENT_NOTES]
+
+        if is_new:
+            profile.note_count += len(notes)
+        profile.updated_at = datetime.now()
+
+    async def forget_notes(self, id_user: UUID, note_ids: Sequence[int], session: AsyncSession) -> None:
+        """Drop deleted notes from the summary and their emotions from the distribution. Does not commit.
+
+        Runs after the delete committed, when the notes' note_emotions rows are already gone
+        (cascade), so the distribution is recounted from what remains.
+        """
+        profile = await self._get_for_update(id_user, session)
+
+        deleted = set(note_ids)
+        profile.recent_notes = [item for item in profile.recent_notes if item.get("id_notes") not in deleted]
+        profile.note_count = max(profile.note_count - len(deleted), 0)
+
+        result = await session.exec(
+            select(func.lower(Emotion.tipe_emosi), func.count())
+            .select_from(NoteEmotion)
+            .join(Notes, Notes.id_notes == NoteEmotion.id_notes)
+            .join(Emotion, Emotion.id_emotion == NoteEmotion.id_emotion)
+            .where(Notes.id_user == id_user)
+            .group_by(func.lower(Emotion.tipe_emosi))
+        )
+        profile.emotion_counts = {emotion: count for emotion, count in result.all()}
+        profile.updated_at = datetime.now()
+
+    async def record_analysis(self, id_user: UUID, emotion: str, mbti: Optional[str], session: AsyncSession) -> None:
+        """Fold one analysed note into the running emotion distribution and MBTI estimate. Does not commit."""
+        profile = await self._get_for_update(id_user, session)
+
+        emotion_counts = dict(profile.emotion_counts)
+        emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
+        profile.emotion_counts = emotion_counts
+
+        if mbti:
+            mbti_counts = dict(profile.mbti_counts)
+            mbti_counts[mbti] = mbti_counts.get(mbti, 0) + 1
+            profile.mbti_counts = mbti_counts
+            profile.mbti = max(mbti_counts, key=mbti_counts.get)
+
+        profile.updated_at = datetime.now()
+
+    def build_context(
+        self,
+        profile: Optional[UserProfile],
+        budget: int,
+        related: Optional[List[str]] = None,
+        exclude_id: Optional[int] = None
+    ) -> List[str]:
+        """Render the profile as history lines for the prompt, most informative first, within budget.
+
+        `related` are excerpts of past notes similar to the one being analysed; they go
+        ahead of the generic recent-notes summary. `exclude_id` is the note being analysed,
+        which is already in recent_notes by then and must not count as its own history.
+        """
+        lines = []
+        if not profile:
+            return fit_to_budget(related or [], budget)
+
+        if profile.mbti:
+            total = sum(profile.mbti_counts.values())
+            lines.append(f"Perkiraan MBTI sejauh ini: {profile.mbti} ({profile.mbti_counts.get(profile.mbti, 0)}/{total} analisis)")
+
+        total_emotions = sum(profile.emotion_counts.values())
+        if total_emotions:
+            distribution = sorted(profile.emotion_counts.items(), key=lambda item: item[1], reverse=True)
+            lines.append("Distribusi emosi dari {} catatan: {}".format(
+                total_emotions,
+                ", ".join(f"{emotion} {count * 100 // total_emotions}%" for emotion, count in distribution)
+            ))
+
+        lines.extend(related or [])
+        lines.extend(
+            item["snippet"] for item in profile.recent_notes
+            if item.get("id_notes") != exclude_id and item["snippet"] not in lines
+        )
+
+        return fit_to_budget(lines, budget)
+
+    async def _get_for_update(self, id_user: UUID, session: AsyncSession) -> UserProfile:
+        query = select(UserProfile).where(UserProfile.id_user == id_user).with_for_update()
+
+        result = await session.exec(query)
+        profile = result.first()
+        if profile:
+            return profile
+
+        # First write for this user; another request may be creating the row concurrently
+        await session.exec(
+            pg_insert(UserProfile).values(
+                id_user=id_user,
+                mbti_counts={},
+                emotion_counts={},
+                recent_notes=[],
+                note_count=0,
+                updated_at=datetime.now()
+            ).on_conflict_do_nothing(index_elements=[UserProfile.id_user])
+        )
+
+        result = await session.exec(query)
+        return result.first()
+
+profile_service = ProfileService()
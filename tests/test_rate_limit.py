@@ -0,0 +1,61 @@
+import pytest
+from litestar import Controller, get, post
+from litestar.middleware import DefineMiddleware
+from litestar.status_codes import HTTP_429_TOO_MANY_REQUESTS
+from litestar.testing import create_test_client
+
+from app.Database.config import Config
+from utils.rate_limit import DEFAULT_RULES, MemoryBackend, RateLimitMiddleware
+
+class ApiStub(Controller):
+    path = "/api"
+
+    @post("/inference")
+    async def inference(self) -> dict:
+        return {}
+
+    @post("/login")
+    async def login(self) -> dict:
+        return {}
+
+    @get("/notes/get_all")
+    async def notes(self) -> dict:
+        return {}
+
+class MetricsStub(Controller):
+    path = "/metrics"
+
+    @get("/")
+    async def metrics(self) -> str:
+        return ""
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(Config, "RATE_LIMIT_ENABLED", True)
+    # A default far below the per-route rules, so a route falling back to it is obvious
+    monkeypatch.setattr(Config, "RATE_LIMIT_REQUESTS", 3)
+    monkeypatch.setattr(Config, "RATE_LIMIT_WINDOW_MINUTES", 15)
+
+    middleware = DefineMiddleware(RateLimitMiddleware, backend=MemoryBackend(), rules=dict(DEFAULT_RULES))
+    with create_test_client([ApiStub, MetricsStub], middleware=[middleware]) as client:
+        yield client
+
+def allowed_before_limit(client, method: str, path: str, attempts: int = 30) -> int:
+    for count in range(attempts):
+        response = client.request(method, path)
+        if response.status_code == HTTP_429_TOO_MANY_REQUESTS:
+            return count
+    return attempts
+
+def test_inference_uses_its_own_rule(client):
+    assert allowed_before_limit(client, "POST", "/api/inference") == DEFAULT_RULES["/api/inference"][0]
+
+def test_login_uses_its_own_rule(client):
+    assert allowed_before_limit(client, "POST", "/api/login") == DEFAULT_RULES["/api/login"][0]
+
+def test_other_routes_use_the_default_rule(client):
+    assert allowed_before_limit(client, "GET", "/api/notes/get_all") == 3
+
+def test_metrics_is_exempt(client):
+    assert allowed_before_limit(client, "GET", "/metrics") == 30
+    assert "RateLimit-Limit" not in client.get("/metrics").headers
@@ -0,0 +1,35 @@
+import hashlib
+from typing import Any, Iterable, Optional, Sequence
+
+from litestar import Response
+from litestar.status_codes import HTTP_304_NOT_MODIFIED
+
+ETAG_HEADER = "ETag"
+
+# Clients may keep responses but must revalidate them with If-None-Match before reuse
+CACHE_CONTROL = "private, no-cache"
+
+def make_etag(rows: Iterable[Sequence[Any]]) -> str:
+    """Strong ETag over a sequence of rows, normally (id, updated_at) pairs in response order."""
+    digest = hashlib.md5()
+    for row in rows:
+        digest.update("|".join(str(value) for value in row).encode("utf-8"))
+        digest.update(b"\n")
+    return f'"{digest.hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # Weak comparison, as RFC 9110 prescribes for If-None-Match
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+def etag_headers(etag: str, **extra: str) -> dict:
+    return {ETAG_HEADER: etag, "Cache-Control": CACHE_CONTROL, **extra}
+
+def not_modified(etag: str) -> Response:
+    return Response(content=None, status_code=HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
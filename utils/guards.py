@@ -0,0 +1,33 @@
+from typing import Optional
+from uuid import UUID
+
+from litestar.connection import ASGIConnection
+from litestar.exceptions import NotAuthorizedException, PermissionDeniedException
+from litestar.handlers.base import BaseRouteHandler
+
+from app.Database.config import Config
+from services.auth_service import auth_service
+
+async def requires_auth(connection: ASGIConnection, _: BaseRouteHandler) -> None:
+    """Reject requests without a valid bearer access token; the user is left on connection.user."""
+    scheme, _, token = connection.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise NotAuthorizedException("Missing bearer token")
+
+    connection.scope["user"] = await auth_service.get_current_user(token)
+
+async def requires_admin(connection: ASGIConnection, _: BaseRouteHandler) -> None:
+    """Only users listed in ADMIN_EMAILS; runs after requires_auth has set connection.user."""
+    user = connection.scope.get("user")
+    if user is None or user.email.lower() not in Config.ADMIN_EMAILS:
+        raise PermissionDeniedException("Admin access required")
+
+def caller_uid(connection: ASGIConnection, user_id: Optional[UUID] = None) -> UUID:
+    """uid of the authenticated caller, for scoping every read and write to their own data.
+
+    A client-sent `user_id` naming anyone else is refused with 403 rather than silently replaced.
+    """
+    uid = connection.user.uid
+    if user_id is not None and user_id != uid:
+        raise PermissionDeniedException("You can only access your own data")
+    return uid
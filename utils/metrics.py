@@ -0,0 +1,222 @@
+import logging
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+
+from litestar.exceptions import HTTPException
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.Database.config import Config
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+Labels = Tuple[str, ...]
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a fixed tuple of label values."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            # [per-bucket counts..., +Inf count, sum]
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            base = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names + ('le',), labels + (str(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{base} {series[-1]}")
+            lines.append(f"{self.name}_count{base} {cumulative}")
+        return lines
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class RequestStats:
+    __slots__ = ("statements", "db_time", "pool_wait", "finished")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.finished = False
+
+# Set by the middleware for the duration of a request. Tasks spawned by a request inherit it, so
+# anything that runs after the response (finished) is counted as background work instead
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+request_latency = Histogram(
+    "moodiary_request_duration_seconds", "HTTP request latency", ("route", "method"), LATENCY_BUCKETS
+)
+request_statements = Histogram(
+    "moodiary_request_sql_statements", "SQL statements executed per request", ("route", "method"), STATEMENT_BUCKETS
+)
+request_db_time = Histogram(
+    "moodiary_request_db_seconds", "Time spent executing SQL per request", ("route", "method"), LATENCY_BUCKETS
+)
+request_pool_wait = Histogram(
+    "moodiary_request_pool_wait_seconds", "Time spent waiting for a pooled connection per request", ("route", "method"), LATENCY_BUCKETS
+)
+requests_total = Counter("moodiary_requests_total", "HTTP requests served", ("route", "method", "status"))
+statements_total = Counter("moodiary_sql_statements_total", "SQL statements executed, inside or outside requests", ("scope",))
+statement_warnings_total = Counter(
+    "moodiary_sql_statement_warnings_total", "Requests that exceeded SQL_STATEMENT_WARN_THRESHOLD", ("route", "method")
+)
+
+METRICS = (
+    request_latency, request_statements, request_db_time, request_pool_wait,
+    requests_total, statements_total, statement_warnings_total,
+)
+
+def record_pool_wait(seconds: float) -> None:
+    stats = _current.get()
+    if stats is not None and not stats.finished:
+        stats.pool_wait += seconds
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info["query_start"] = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info.pop("query_start", time.perf_counter())
+    stats = _current.get()
+
+    if stats is None or stats.finished:
+        statements_total.inc(("background",))
+        return
+
+    statements_total.inc(("request",))
+    stats.statements += 1
+    stats.db_time += elapsed
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Count and time every statement run through the engine."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+def route_template(scope: Scope) -> str:
+    """Full path template of the matched route, e.g. "/api/notes/get_single/{note_id:int}".
+
+    Labels use the template, never the raw path, so IDs in URLs don't explode cardinality.
+    A handler's own `paths` are relative to its controller ("/" for /metrics), so the
+    router's template is used, or the owner chain is joined when it is missing.
+    """
+    template = scope.get("path_template")
+    if template:
+        return template
+
+    route_handler = scope.get("route_handler")
+    paths = getattr(route_handler, "paths", None)
+    if not paths:
+        return "unmatched"
+
+    path = min(paths)
+    layer = getattr(route_handler, "owner", None)
+    while layer is not None:
+        prefix = getattr(layer, "path", "") or ""
+        if prefix and prefix != "/":
+            path = prefix.rstrip("/") + ("" if path == "/" else path)
+        layer = getattr(layer, "owner", None)
+    return path
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and SQL usage per route."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = [500]
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except HTTPException as e:
+            # Rejections raised by inner middleware (429s, guards) reach us before the exception
+            # handler turns them into a response; record their real status, not a 500
+            status[0] = e.status_code
+            raise
+        finally:
+            _current.reset(token)
+            stats.finished = True
+            self._record(scope, stats, status[0], time.perf_counter() - start)
+
+    def _record(self, scope: Scope, stats: RequestStats, status: int, elapsed: float) -> None:
+        labels = (route_template(scope), scope["method"])
+
+        request_latency.observe(labels, elapsed)
+        request_statements.observe(labels, stats.statements)
+        request_db_time.observe(labels, stats.db_time)
+        request_pool_wait.observe(labels, stats.pool_wait)
+        requests_total.inc(labels + (str(status),))
+
+        if stats.statements > Config.SQL_STATEMENT_WARN_THRESHOLD:
+            statement_warnings_total.inc(labels)
+            logger.warning(
+                "%s %s ran %s SQL statements (threshold %s), possible N+1",
+                labels[1], labels[0], stats.statements, Config.SQL_STATEMENT_WARN_THRESHOLD
+            )
+
+def render_metrics(extra_gauges: Dict[str, Tuple[str, float]] = None) -> str:
+    """Everything in Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+
+    for name, (help_text, value) in (extra_gauges or {}).items():
+        lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"])
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,43 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple, Union
+
+from litestar.exceptions import ValidationException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+SortValue = Union[datetime, float]
+
+# Cursor kinds: listings page by timestamp, full-text search by rank
+TIMESTAMP_CURSOR = "t"
+RANK_CURSOR = "r"
+
+def encode_cursor(sort_value: SortValue, note_id: int) -> str:
+    """Opaque keyset cursor pointing just past (sort_value, note_id).
+
+    The sort value is a timestamp for listings or a float rank for full-text search.
+    """
+    if isinstance(sort_value, datetime):
+        payload = [TIMESTAMP_CURSOR, sort_value.isoformat(), note_id]
+    else:
+        payload = [RANK_CURSOR, float(sort_value), note_id]
+
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, expected_kind: str) -> Tuple[SortValue, int]:
+    """(sort_value, note_id) from `cursor`; a cursor of another kind (e.g. a search cursor
+    passed to the listing) is rejected like a malformed one."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, sort_value, note_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+        if kind == expected_kind == TIMESTAMP_CURSOR:
+            return datetime.fromisoformat(sort_value), int(note_id)
+        if kind == expected_kind == RANK_CURSOR:
+            return float(sort_value), int(note_id)
+    except (ValueError, TypeError):
+        pass
+
+    raise ValidationException("Invalid pagination cursor")
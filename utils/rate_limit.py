@@ -0,0 +1,169 @@
+import json
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+from litestar.exceptions import HTTPException, TooManyRequestsException
+from litestar.stores.base import Store
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.Database.config import Config
+from utils.metrics import route_template
+from services.auth_cache import auth_cache
+
+# (requests, window in seconds) per full route template as returned by route_template (controller
+# path included, e.g. "/metrics" not "/"); None disables limiting for that route
+Rule = Optional[Tuple[int, int]]
+
+DEFAULT_RULES: Dict[str, Rule] = {
+    "/api/inference": (10, 60),
+    "/api/inference/stream": (10, 60),
+    "/api/login": (5, 60),
+    "/api/register": (10, 3600),
+    "/api/refresh": (30, 60),
+    "/metrics": None,
+}
+
+class MemoryBackend:
+    """Counters in a dict; only correct with a single worker process."""
+
+    def __init__(self, sweep_every: int = 1000):
+        self._counters: Dict[str, Tuple[int, float]] = {}
+        self._sweep_every = sweep_every
+        self._calls = 0
+
+    async def increment(self, key: str, ttl: int) -> int:
+        now = time.monotonic()
+        self._calls += 1
+        if self._calls % self._sweep_every == 0:
+            self._counters = {k: v for k, v in self._counters.items() if v[1] > now}
+
+        count, expires_at = self._counters.get(key, (0, 0.0))
+        if expires_at <= now:
+            count, expires_at = 0, now + ttl
+
+        self._counters[key] = (count + 1, expires_at)
+        return count + 1
+
+    async def get(self, key: str) -> int:
+        count, expires_at = self._counters.get(key, (0, 0.0))
+        return count if expires_at > time.monotonic() else 0
+
+class StoreBackend:
+    """Counters in a Litestar Store, e.g. RedisStore to share limits between workers.
+
+    The Store API has no atomic increment, so concurrent hits on one key may undercount slightly.
+    """
+
+    def __init__(self, store: Store):
+        self.store = store
+
+    async def increment(self, key: str, ttl: int) -> int:
+        count = await self.get(key) + 1
+        await self.store.set(key, str(count), expires_in=ttl)
+        return count
+
+    async def get(self, key: str) -> int:
+        value = await self.store.get(key)
+        return int(value) if value else 0
+
+def create_backend(name: str):
+    if name == "redis":
+        from litestar.stores.redis import RedisStore
+        return StoreBackend(RedisStore.with_client(url=Config.RATE_LIMIT_REDIS_URL, namespace="ratelimit"))
+
+    if name == "store":
+        # Local stand-in for the shared backend: same code path as redis, kept in process
+        from litestar.stores.memory import MemoryStore
+        return StoreBackend(MemoryStore())
+
+    return MemoryBackend()
+
+def load_rules() -> Dict[str, Rule]:
+    rules = dict(DEFAULT_RULES)
+    if Config.RATE_LIMIT_RULES:
+        for path, rule in json.loads(Config.RATE_LIMIT_RULES).items():
+            rules[path] = tuple(rule) if rule else None
+    return rules
+
+def client_identity(scope: Scope) -> str:
+    """User id from a valid bearer token, otherwise the client IP."""
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    return f"user:{auth_cache.verify_token(token).user_id}"
+                except HTTPException:
+                    pass
+            break
+
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+class RateLimitMiddleware:
+    """Sliding-window rate limiting per client and route.
+
+    Approximates a true sliding window from two fixed windows: the previous window's
+    count is weighted by how much of it still overlaps the sliding window.
+    """
+
+    def __init__(self, app: ASGIApp, backend=None, rules: Dict[str, Rule] = None):
+        self.app = app
+        self.backend = backend or rate_limit_backend
+        self.rules = rules if rules is not None else rate_limit_rules
+        self.default_rule: Rule = (Config.RATE_LIMIT_REQUESTS, Config.RATE_LIMIT_WINDOW_MINUTES * 60)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not Config.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        route = route_template(scope)
+        rule = self.rules.get(route, self.default_rule)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit, window = rule
+        now = time.time()
+        index = int(now // window)
+        elapsed = (now % window) / window
+        key = f"{client_identity(scope)}:{route}"
+
+        previous = await self.backend.get(f"{key}:{index - 1}")
+        current = await self.backend.get(f"{key}:{index}")
+        used = previous * (1 - elapsed) + current
+
+        if used >= limit:
+            # Time until enough of the previous window slides out, at most until the next window
+            retry_after = (1 - elapsed) * window
+            if previous and current < limit:
+                retry_after = min(retry_after, (used - limit) / previous * window)
+            headers = rate_limit_headers(limit, 0, window, elapsed)
+            headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+            raise TooManyRequestsException(detail="Too many requests, please slow down", headers=headers)
+
+        current = await self.backend.increment(f"{key}:{index}", ttl=window * 2)
+        remaining = max(0, math.floor(limit - previous * (1 - elapsed) - current))
+        headers = rate_limit_headers(limit, remaining, window, elapsed)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+def rate_limit_headers(limit: int, remaining: int, window: int, elapsed: float) -> Dict[str, str]:
+    return {
+        "RateLimit-Limit": str(limit),
+        "RateLimit-Remaining": str(remaining),
+        "RateLimit-Reset": str(max(1, math.ceil((1 - elapsed) * window))),
+        "RateLimit-Policy": f"{limit};w={window}",
+    }
+
+rate_limit_backend = create_backend(Config.RATE_LIMIT_BACKEND)
+rate_limit_rules = load_rules()
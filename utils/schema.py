@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Union, Optional
+from uuid import UUID
 
 class DeleteRequest(BaseModel):
     ids: Union[str, List[str]]
@@ -20,4 +21,5 @@ class RefreshTokenRequest(BaseModel):
 
 class InferenceModelInput(BaseModel):
     text: str = None
-    history_notes: Optional[List[str]] = None
\ No newline at end of file
+    history_notes: Optional[List[str]] = None  # Deprecated: send id_user and the server-side profile is used
+    id_user: Optional[UUID] = None
\ No newline at end of file
@@ -1,5 +1,7 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.Database.config import Config
@@ -7,17 +9,56 @@ from app.Models.user import TokenData
 from litestar.exceptions import HTTPException
 from litestar.status_codes import HTTP_401_UNAUTHORIZED
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max pin the cost so hashes made with any other cost report needs_update
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=Config.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=Config.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=Config.BCRYPT_ROUNDS,
+)
+
+# Module-level so they can be pickled into a process pool
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
 
 class SecurityManager:
     def __init__(self):
         self.pwd_context = pwd_context
+        self._executor: Optional[Executor] = None
         
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         return self.pwd_context.verify(plain_password, hashed_password)
     
     def get_password_hash(self, password: str) -> str:
         return self.pwd_context.hash(password)
+
+    async def hash_password(self, password: str) -> str:
+        """get_password_hash on the hashing pool, so bcrypt never blocks the event loop."""
+        return await self._run(_hash_password, password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify on the hashing pool; also returns a fresh hash when the stored cost is out of date."""
+        return await self._run(_verify_and_update, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, fn, *args):
+        if self._executor is None:
+            if Config.PASSWORD_HASH_EXECUTOR == "process":
+                self._executor = ProcessPoolExecutor(max_workers=Config.PASSWORD_HASH_WORKERS)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=Config.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+                )
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
     
     def validate_password_strength(self, password: str) -> bool:
         if len(password) < 8:
@@ -60,7 +101,12 @@ class SecurityManager:
                     status_code=HTTP_401_UNAUTHORIZED,
                     detail="Invalid token"
                 )
-            return TokenData(email=email, user_id=user_id)
+            expires_at = payload.get("exp")
+            return TokenData(
+                email=email,
+                user_id=user_id,
+                expires_at=datetime.fromtimestamp(expires_at, timezone.utc) if expires_at else None
+            )
         except JWTError:
             raise HTTPException(
                 status_code=HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,31 @@
+import re
+from typing import Iterable, List, Tuple
+
+class JSONFieldScanner:
+    """Picks top-level string fields out of a JSON object while it is still being streamed.
+
+    Each requested field is reported once, as soon as its closing quote has arrived,
+    so callers can act on it before the rest of the completion is in.
+    """
+
+    def __init__(self, fields: Iterable[str]):
+        self.buffer = ""
+        self.found = {}
+        self._patterns = {
+            field: re.compile(r'"%s"\s*:\s*"((?:[^"\\]|\\.)*)"' % re.escape(field))
+            for field in fields
+        }
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        self.buffer += chunk
+        emitted = []
+
+        for field, pattern in self._patterns.items():
+            if field in self.found:
+                continue
+            match = pattern.search(self.buffer)
+            if match:
+                self.found[field] = match.group(1)
+                emitted.append((field, match.group(1)))
+
+        return emitted
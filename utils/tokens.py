@@ -0,0 +1,33 @@
+from typing import Iterable, List
+
+# Rough average for the tokenizers we use; good enough for budgeting prompts.
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // CHARS_PER_TOKEN + 1
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    max_chars = budget * CHARS_PER_TOKEN
+    text = text or ""
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rstrip() + "…"
+
+def fit_to_budget(items: Iterable[str], budget: int) -> List[str]:
+    """Keep items in order until the token budget is spent; the item that overflows is truncated."""
+    kept = []
+    remaining = budget
+
+    for item in items:
+        if remaining <= 0:
+            break
+
+        cost = estimate_tokens(item)
+        if cost > remaining:
+            kept.append(truncate_to_tokens(item, remaining))
+            break
+
+        kept.append(item)
+        remaining -= cost
+
+    return kept